@@ -0,0 +1,114 @@
+"""Shared gRPC channels for the handles talking to the same endpoint."""
+import atexit
+import time
+import grpc
+from functools import partial
+
+# Channels are keyed by their target (ip:port or socket path). Stubs are cheap
+# and remain per handle, only the underlying HTTP/2 connection is shared.
+_channel_cache = {}
+
+# RPC method names per stub class, the stubs create them on construction.
+_rpc_methods = {}
+
+# How long to wait for a cached channel to become ready before assuming it is
+# stuck in reconnect backoff (i.e. the container behind it was restarted).
+CHANNEL_READY_TIMEOUT = 5
+
+# Keepalive pings let a channel notice a restarted container without waiting
+# for a request to time out. The channels don't share their subchannels as each
+# target only has one channel anyway.
+CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.use_local_subchannel_pool", 1),
+]
+
+# How long to wait for a new channel to connect. This is best effort only, the
+# handles still verify that the gRPC services respond.
+CHANNEL_CONNECT_TIMEOUT = 30
+
+
+def get_channel(target):
+    """Returns the shared channel for the target, creating it if needed."""
+    channel = _channel_cache.get(target)
+    if channel is None:
+        channel = grpc.insecure_channel(target, options=CHANNEL_OPTIONS)
+        _channel_cache[target] = channel
+    return channel
+
+
+def renew_channel(target):
+    """Replaces the shared channel for the target with a new one and closes
+    the old one, which would otherwise keep reconnecting in the background."""
+    old = _channel_cache.pop(target, None)
+    channel = get_channel(target)
+    if old is not None:
+        old.close()
+    return channel
+
+
+def _wait_ready(futures, deadline):
+    """Waits for the ready futures until the deadline, returning the keys of
+    those which did not complete."""
+    pending = []
+    for key, future in futures.items():
+        try:
+            future.result(timeout=max(0, deadline - time.monotonic()))
+        except grpc.FutureTimeoutError:
+            future.cancel()
+            pending.append(key)
+    return pending
+
+
+def ready_channels(targets, renew=False):
+    """Returns the shared channels for the targets, waiting concurrently for
+    all of them to connect. Cached channels which do not become ready in time
+    are replaced by new ones. With renew, they are replaced up front instead,
+    for targets whose containers were just restarted."""
+    if renew:
+        for t in targets:
+            renew_channel(t)
+    cached = {
+        t: grpc.channel_ready_future(_channel_cache[t])
+        for t in targets
+        if t in _channel_cache
+    }
+    for t in _wait_ready(cached, time.monotonic() + CHANNEL_READY_TIMEOUT):
+        renew_channel(t)
+
+    futures = {t: grpc.channel_ready_future(get_channel(t)) for t in targets}
+    _wait_ready(futures, time.monotonic() + CHANNEL_CONNECT_TIMEOUT)
+    return [get_channel(t) for t in targets]
+
+
+def ready_channel(target):
+    """Returns the shared channel for the target once it is connected."""
+    return ready_channels([target])[0]
+
+
+def rpc_methods(stub):
+    """Names of the RPC methods of the stub."""
+    methods = _rpc_methods.get(type(stub))
+    if methods is None:
+        methods = tuple(f for f in vars(stub) if not f.startswith("_"))
+        _rpc_methods[type(stub)] = methods
+    return methods
+
+
+def rpc_future(method, request, **kwargs):
+    """Starts the RPC without waiting for its completion, also for methods
+    that had a default timeout installed."""
+    if isinstance(method, partial):
+        kwargs = {**method.keywords, **kwargs}
+        method = method.func
+    return method.future(request, **kwargs)
+
+
+def close_channels():
+    """Closes all shared channels."""
+    while _channel_cache:
+        _, channel = _channel_cache.popitem()
+        channel.close()
+
+
+atexit.register(close_channels)
@@ -1,58 +1,210 @@
 import asyncio
+import atexit
 from collections import namedtuple
 import asyncssh
+import os
+import shlex
+import socket
 import subprocess
 
 CommandReturn = namedtuple("CommandReturn", "returncode stdout stderr")
 
+# Buffer size of the stream readers of local commands, large enough to take
+# fio output bursts in a few reads.
+STREAM_LIMIT = 1 << 20
+
+# SSH connections are cached per host and reused by run_cmd_async_at, so that
+# every remote command only opens a new session on an existing connection.
+# Connections are bound to the event loop that created them, hence the cache
+# is keyed by the running loop. The connections of loops closed in the
+# meantime are dropped on the next connect and the rest at exit.
+_conn_cache = {}
+_conn_locks = {}
+
+# sshd refuses more than MaxSessions (10 by default) sessions per connection,
+# so concurrent remote commands queue for one of fewer session slots per host.
+MAX_SESSIONS = 8
+_session_slots = {}
+
+
+def argv(cmd):
+    """Returns the command as an argument list, splitting it if a string."""
+    return shlex.split(cmd) if isinstance(cmd, str) else list(cmd)
+
+
+def decode(data):
+    """Decodes command output, taking the cheaper latin-1 path for ASCII."""
+    return data.decode("latin-1") if data.isascii() else data.decode()
+
 
 def run_cmd(cmd, check=True):
-    subprocess.run(cmd, shell=True, check=check)
+    subprocess.run(argv(cmd), check=check)
+
+
+def create_local_files(paths, size):
+    """Creates sparse files of the given size in bytes, replacing existing ones.
+    Only falls back to sudo when the files can't be written directly, i.e.
+    when a previous run left them behind owned by root."""
+    try:
+        for path in paths:
+            fd = os.open(path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+            try:
+                os.ftruncate(fd, size)
+            finally:
+                os.close(fd)
+    except PermissionError:
+        script = f'rm -f "$@" && truncate -s {size} "$@"'
+        subprocess.run(["sudo", "sh", "-c", script, "sh"] + list(paths), check=True)
+
+
+def remove_local_files(paths):
+    """Removes the files, using sudo for those owned by someone else."""
+    denied = []
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except PermissionError:
+            denied.append(path)
+    if denied:
+        subprocess.run(["sudo", "rm", "-f"] + denied, check=True)
 
 
 async def run_cmd_async(cmd):
     """Runs a command on the current machine."""
-    proc = await asyncio.create_subprocess_shell(
-        cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    proc = await asyncio.create_subprocess_exec(
+        *argv(cmd),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=STREAM_LIMIT,
     )
     stdout, stderr = await proc.communicate()
-
-    output_message = f"\n[{proc.pid}] Command:\n{cmd}"
-    # Append stdout/stderr to the output message
-    if stdout.decode() != "":
-        output_message += f"\n[{proc.pid}] stdout:\n{stdout.decode()}"
-    if stderr.decode() != "":
-        output_message += f"\n[{proc.pid}] stderr:\n{stderr.decode()}"
+    stdout = decode(stdout)
+    stderr = decode(stderr)
 
     # If a non-zero return code was thrown, raise an exception
     if proc.returncode != 0:
+        output_message = f"\n[{proc.pid}] Command:\n{cmd}"
+        # Append stdout/stderr to the output message
+        if stdout:
+            output_message += f"\n[{proc.pid}] stdout:\n{stdout}"
+        if stderr:
+            output_message += f"\n[{proc.pid}] stderr:\n{stderr}"
+
         output_message += f"\nReturned error code: {proc.returncode}"
 
-        if stderr.decode() != "":
-            output_message += f"\nstderr:\n{stderr.decode()}"
+        if stderr:
+            output_message += f"\nstderr:\n{stderr}"
         raise ChildProcessError(output_message)
 
-    return CommandReturn(proc.returncode, stdout.decode(), stderr.decode())
-
-
-async def run_cmd_async_at(host, cmd):
-    """Runs the command async at the given host."""
-    async with asyncssh.connect(host) as conn:
-        result = await conn.run(cmd, check=False)
-
+    return CommandReturn(proc.returncode, stdout, stderr)
+
+
+def _drop_connections(loop):
+    """Drops the cached connections of a loop that can no longer run them,
+    shutting their sockets down so that the remote sessions end."""
+    _conn_locks.pop(loop, None)
+    _session_slots.pop(loop, None)
+    for conn in _conn_cache.pop(loop, {}).values():
+        sock = conn.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+async def _connect_at(host):
+    """Returns the cached connection to the given host, connecting if needed.
+    A cached connection is only replaced once it is closed, as other tasks may
+    still have sessions open on it."""
+    loop = asyncio.get_running_loop()
+    for closed in [other for other in _conn_cache if other.is_closed()]:
+        _drop_connections(closed)
+    conns = _conn_cache.setdefault(loop, {})
+    lock = _conn_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        conn = conns.get(host)
+        if conn is None or conn.is_closed():
+            conn = await asyncssh.connect(host, keepalive_interval=30)
+            conns[host] = conn
+        return conn
+
+
+async def _close_connections(conns):
+    for conn in conns.values():
+        conn.close()
+    for conn in conns.values():
+        await conn.wait_closed()
+
+
+async def close_remote_connections():
+    """Closes all cached connections of the running event loop."""
+    loop = asyncio.get_running_loop()
+    _conn_locks.pop(loop, None)
+    _session_slots.pop(loop, None)
+    await _close_connections(_conn_cache.pop(loop, {}))
+
+
+def close_all_remote_connections():
+    """Closes the cached connections of all event loops."""
+    for loop in list(_conn_cache):
+        if loop.is_closed() or loop.is_running():
+            _drop_connections(loop)
+        else:
+            _conn_locks.pop(loop, None)
+            _session_slots.pop(loop, None)
+            loop.run_until_complete(_close_connections(_conn_cache.pop(loop)))
+
+
+atexit.register(close_all_remote_connections)
+
+
+async def _run_at(host, cmd):
+    """Runs the command on the cached connection to the host. The start is
+    retried once on a new connection only if the cached one turned out to be
+    closed; a refused session (e.g. beyond sshd's MaxSessions) is raised, and
+    a started command is never run twice."""
+    conn = await _connect_at(host)
+    try:
+        process = await conn.create_process(cmd, encoding=None)
+    except (asyncssh.Error, OSError):
+        if not conn.is_closed():
+            raise
+        conn = await _connect_at(host)
+        process = await conn.create_process(cmd, encoding=None)
+    try:
+        return await process.wait(check=False)
+    finally:
+        # Frees the session also when the wait is cancelled on timeout.
+        process.close()
+
+
+async def run_cmd_async_at(host, cmd, timeout=None):
+    """Runs the command async at the given host. An argument list is quoted
+    for the remote shell. The timeout only starts once a session slot is
+    free, raising asyncio.TimeoutError when exceeded."""
+    if not isinstance(cmd, str):
+        cmd = shlex.join(cmd)
+    slots = _session_slots.setdefault(asyncio.get_running_loop(), {})
+    async with slots.setdefault(host, asyncio.Semaphore(MAX_SESSIONS)):
+        result = await asyncio.wait_for(_run_at(host, cmd), timeout)
+    stdout = decode(result.stdout)
+    stderr = decode(result.stderr)
+
+    if result.exit_status != 0:
         output_message = f"Command: {host}:{cmd}\n"
         # Append stdout/stderr to the output message
-        if result.stdout != "":
-            output_message += f"\nstdout:\n{result.stdout}"
-        if result.stderr != "":
-            output_message += f"\nstderr:\n{result.stderr}"
-
-        if result.exit_status != 0:
+        if stdout:
+            output_message += f"\nstdout:\n{stdout}"
+        if stderr:
+            output_message += f"\nstderr:\n{stderr}"
 
-            output_message += f"\nReturned error code: {result.exit_status}"
+        output_message += f"\nReturned error code: {result.exit_status}"
 
-            if result.stderr != "":
-                output_message += f"\nstderr:\n{result.stderr}"
-            raise ChildProcessError(output_message)
+        if stderr:
+            output_message += f"\nstderr:\n{stderr}"
+        raise ChildProcessError(output_message)
 
-        return CommandReturn(result.exit_status, result.stdout, result.stderr)
+    return CommandReturn(result.exit_status, stdout, stderr)
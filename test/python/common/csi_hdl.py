@@ -1,17 +1,18 @@
-import grpc
 import csi_pb2 as pb
 import csi_pb2_grpc as rpc
+from common.channel import get_channel
 
 
 class CsiHandle(object):
     def __init__(self, csi_socket):
-        self.channel = grpc.insecure_channel(csi_socket)
+        self.channel = get_channel(csi_socket)
         # self.controller = rpc.ControllerStub(self.channel)
         self.identity = rpc.IdentityStub(self.channel)
         self.node = rpc.NodeStub(self.channel)
 
-    def __del__(self):
-        del self.channel
-
     def close(self):
-        self.__del__()
+        """Drop this handle's stubs, the channel itself is shared and closed
+        together with the other shared channels."""
+        self.identity = None
+        self.node = None
+        self.channel = None
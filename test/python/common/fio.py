@@ -1,36 +1,99 @@
+import os
+import shlex
 import shutil
+from functools import lru_cache
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+@lru_cache(maxsize=1)
+def fio_path():
+    """Location of the fio binary, looked up once per session."""
+    return shutil.which("fio")
+
+
+def fio_results(output):
+    """Parse the IOPS and completion latency percentiles of the first job
+    from fio's JSON output, skipping anything printed around it (e.g. by the
+    SPDK plugin)."""
+    start, end = output.find("{"), output.rfind("}") + 1
+    job = json_loads(output[start:end])["jobs"][0]
+
+    results = {}
+    for op in ("read", "write"):
+        results[op] = {
+            "iops": job[op]["iops"],
+            "clat_percentile": job[op]["clat_ns"].get("percentile", {}),
+        }
+    return results
 
 
 class Fio(object):
-    def __init__(self, name, rw, device, size=None, runtime=15, optstr=""):
+    _BASE = (
+        "sudo",
+        "fio",
+        "--ioengine=io_uring",
+        "--direct=1",
+        "--bs=4k",
+        "--time_based=1",
+        "--group_reporting=1",
+        "--norandommap=1",
+        "--iodepth=64",
+    )
+    _POLL = (
+        "--fixedbufs=1",
+        "--registerfiles=1",
+        "--hipri=1",
+        "--sqthread_poll=1",
+    )
+
+    def __init__(self, name, rw, device, size=None, runtime=15, optstr="", poll=False):
         self.name = name
         self.rw = rw
         self.device = device
-        self.cmd = shutil.which("fio")
+        self.cmd = fio_path()
         self.output = {}
         self.success = {}
         self.runtime = runtime
         self.optstr = optstr
         self.size = size
+        # Polled io_uring (SQPOLL + hipri) needs kernel and device support
+        # (i.e. nvme poll queues), so it is opt-in.
+        self.poll = poll
+        self._argv = None
 
     def build(self):
+        """Returns the fio command as an argument list."""
+        if self._argv is not None:
+            return list(self._argv)
+
         devs = [self.device] if isinstance(self.device, str) else self.device
-        size = ""
+        command = list(self._BASE)
+
+        if self.poll:
+            command += self._POLL
+            cpu = os.environ.get("CPU_PIN")
+            if cpu is not None:
+                command.append("--sqthread_poll_cpu={}".format(cpu))
+
+        command += shlex.split(self.optstr)
+        command += [
+            "--rw={}".format(self.rw),
+            "--runtime={}".format(self.runtime),
+            "--name={}".format(self.name),
+            "--filename={}".format(":".join(map(str, devs))),
+            "--output-format=json",
+        ]
         if self.size is not None:
-            size = "--size={}".format(self.size)
-
-        command = (
-            "sudo fio --ioengine=linuxaio --direct=1 --bs=4k "
-            "--time_based=1 {} --rw={} "
-            "--group_reporting=1 --norandommap=1 --iodepth=64 "
-            "--runtime={} --name={} --filename={} {}"
-        ).format(
-            self.optstr,
-            self.rw,
-            self.runtime,
-            self.name,
-            ":".join(map(str, devs)),
-            size,
-        )
+            command.append("--size={}".format(self.size))
 
+        self._argv = tuple(command)
         return command
+
+    def results(self, stdout):
+        """Parse the stdout of the completed run into self.output."""
+        self.output = fio_results(stdout)
+        return self.output
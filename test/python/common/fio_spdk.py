@@ -1,45 +1,74 @@
 import os
-import shutil
+from functools import lru_cache
 from urllib.parse import urlparse
+from common.fio import fio_path, fio_results
+
+
+@lru_cache(maxsize=1)
+def spdk_fio_path():
+    """Location of the SPDK fio plugin, resolved once per session."""
+    spdk_fio_path = os.environ.get("FIO_SPDK")
+    if spdk_fio_path is None:
+        spdk_path = os.environ.get("SPDK_PATH")
+        if spdk_path is None:
+            spdk_path = os.getcwd() + "/../../spdk-rs/spdk/build"
+        spdk_fio_path = "{}/fio/spdk_nvme".format(spdk_path)
+    return spdk_fio_path
 
 
 class FioSpdk(object):
+    _BASE = (
+        "fio",
+        "--ioengine=spdk",
+        "--direct=1",
+        "--bs=4k",
+        "--time_based=1",
+        "--thread=1",
+        "--group_reporting=1",
+        "--norandommap=1",
+        "--iodepth=64",
+    )
+
     def __init__(self, name, rw, uris, runtime=15):
         self.name = name
         self.rw = rw
         if isinstance(uris, str):
             uris = [uris]
 
-        self.filenames = []
+        # Colons separate fio's filenames, so the ones within the NQN are escaped.
+        self.targets = []
         for uri in uris:
             u = urlparse(uri)
-            self.filenames.append(
-                (
-                    "'trtype=tcp adrfam=IPv4 traddr={} " "trsvcid={} subnqn={} ns=1'"
-                ).format(u.hostname, u.port, u.path[1:].replace(":", "\\:"))
-            )
+            self.targets.append((u.hostname, u.port, u.path[1:].replace(":", "\\:")))
 
-        self.cmd = shutil.which("fio")
+        self.cmd = fio_path()
         self.runtime = runtime
+        self.output = {}
+        self._argv = None
 
-    def build(self) -> str:
-        spdk_fio_path = os.environ.get("FIO_SPDK")
-        if spdk_fio_path is None:
-            spdk_path = os.environ.get("SPDK_PATH")
-            if spdk_path is None:
-                spdk_path = os.getcwd() + "/../../spdk-rs/spdk/build"
-            spdk_fio_path = "{}/fio/spdk_nvme".format(spdk_path)
-        command = (
-            "sudo LD_PRELOAD={} fio --ioengine=spdk "
-            "--direct=1 --bs=4k --time_based=1 --runtime={} "
-            "--thread=1 --rw={} --group_reporting=1 --norandommap=1 "
-            "--iodepth=64 --name={} --filename={}"
-        ).format(
-            spdk_fio_path,
-            self.runtime,
-            self.rw,
-            self.name,
-            " --filename=".join(map(str, self.filenames)),
+    def build(self):
+        """Returns the fio command as an argument list."""
+        if self._argv is not None:
+            return list(self._argv)
+
+        command = ["sudo", "LD_PRELOAD={}".format(spdk_fio_path())]
+        command += self._BASE
+        command += [
+            "--runtime={}".format(self.runtime),
+            "--rw={}".format(self.rw),
+            "--name={}".format(self.name),
+            "--output-format=json",
+        ]
+        filenames = ":".join(
+            f"trtype=tcp adrfam=IPv4 traddr={host} trsvcid={port} subnqn={nqn} ns=1"
+            for host, port, nqn in self.targets
         )
+        command.append(f"--filename={filenames}")
 
+        self._argv = tuple(command)
         return command
+
+    def results(self, stdout):
+        """Parse the stdout of the completed run into self.output."""
+        self.output = fio_results(stdout)
+        return self.output
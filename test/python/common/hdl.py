@@ -4,9 +4,18 @@ import grpc
 import mayastor_pb2_grpc as rpc
 from pytest_testconfig import config
 from functools import partial
+from common.channel import (
+    ready_channel,
+    renew_channel,
+    rpc_future,
+    rpc_methods,
+)
 
 pytest_plugins = ["docker_compose"]
 
+# Requests without arguments are never modified, so they can be shared.
+NULL = pb.Null()
+
 
 class MayastorHandle(object):
     """Mayastor gRPC handle."""
@@ -15,7 +24,7 @@ class MayastorHandle(object):
         """Init."""
         self.ip_v4 = ip_v4
         self.timeout = float(config["grpc"]["client_timeout"])
-        self.channel = grpc.insecure_channel(("%s:10124") % self.ip_v4)
+        self.channel = ready_channel("%s:10124" % self.ip_v4)
         self.bdev = rpc.BdevRpcStub(self.channel)
         self.ms = rpc.MayastorStub(self.channel)
         self._readiness_check()
@@ -27,33 +36,35 @@ class MayastorHandle(object):
         stub = getattr(rpc, name)(self.channel)
 
         # Install default timeout to all functions, ignore system attributes.
-        for f in dir(stub):
-            if not f.startswith("__"):
-                h = getattr(stub, f)
-                setattr(stub, f, partial(h, timeout=self.timeout))
+        for f in rpc_methods(stub):
+            h = getattr(stub, f)
+            setattr(stub, f, partial(h, timeout=self.timeout))
         return stub
 
+    def _list_all(self):
+        """List bdevs and pools, with both requests in flight at once."""
+        bdevs = rpc_future(self.bdev.List, NULL, wait_for_ready=True)
+        pools = rpc_future(self.ms.ListPools, NULL, wait_for_ready=True)
+        bdevs.result()
+        pools.result()
+
     def _readiness_check(self):
         try:
-            self.bdev_list()
-            self.pool_list()
-        except grpc._channel._InactiveRpcError:
+            self._list_all()
+        except grpc.RpcError:
             # This is to get around a gRPC bug.
             # Retry once before failing
-            self.bdev_list()
-            self.pool_list()
+            self._list_all()
 
     def reconnect(self):
-        self.channel = grpc.insecure_channel(("%s:10124") % self.ip_v4)
+        self.channel = renew_channel("%s:10124" % self.ip_v4)
         self.bdev = self.install_stub("BdevRpcStub")
         self.ms = self.install_stub("MayastorStub")
         self._readiness_check()
 
-    def __del__(self):
-        del self.channel
-
     def close(self):
-        self.__del__()
+        """Drop this handle's reference, the channel itself is shared."""
+        self.channel = None
 
     def ip_address(self):
         return self.ip_v4
@@ -127,11 +138,11 @@ class MayastorHandle(object):
 
     def replica_list(self):
         """List existing replicas"""
-        return self.ms.ListReplicas(pb.Null())
+        return self.ms.ListReplicas(NULL)
 
     def replica_list_v2(self):
         """List existing replicas along with their UUIDs"""
-        return self.ms.ListReplicasV2(pb.Null())
+        return self.ms.ListReplicasV2(NULL)
 
     def nexus_create(self, uuid, size, children):
         """Create a nexus with the given uuid and size. The children should
@@ -180,11 +191,11 @@ class MayastorHandle(object):
 
     def nexus_list(self):
         """List all the nexus devices."""
-        return self.ms.ListNexus(pb.Null()).nexus_list
+        return self.ms.ListNexus(NULL).nexus_list
 
     def nexus_list_v2(self):
         """List all the nexus devices, with separate name and uuid."""
-        return self.ms.ListNexusV2(pb.Null()).nexus_list
+        return self.ms.ListNexusV2(NULL).nexus_list
 
     def nexus_add_replica(self, uuid, uri, norebuild):
         """Add a new replica to the nexus"""
@@ -196,18 +207,31 @@ class MayastorHandle(object):
         """Add a new replica to the nexus"""
         return self.ms.RemoveChildNexus(pb.RemoveChildNexusRequest(uuid=uuid, uri=uri))
 
+    def rebuild_state(self, uuid, uri):
+        """Get the state of the rebuild to the child, None if there is no job."""
+        try:
+            return self.ms.GetRebuildState(
+                pb.RebuildStateRequest(uuid=uuid, uri=uri)
+            ).state
+        except grpc.RpcError:
+            return None
+
+    def rebuild_stop(self, uuid, uri):
+        """Stop the rebuild to the child."""
+        return self.ms.StopRebuild(pb.StopRebuildRequest(uuid=uuid, uri=uri))
+
     def bdev_list(self):
         """List all bdevs found within the system."""
-        return self.bdev.List(pb.Null(), wait_for_ready=True).bdevs
+        return self.bdev.List(NULL, wait_for_ready=True).bdevs
 
     def pool_list(self):
         """Only list pools"""
-        return self.ms.ListPools(pb.Null(), wait_for_ready=True)
+        return self.ms.ListPools(NULL, wait_for_ready=True)
 
     def pools_as_uris(self):
         """Return a list of pools as found on the system."""
         uris = []
-        pools = self.ms.ListPools(pb.Null(), wait_for_ready=True)
+        pools = self.ms.ListPools(NULL, wait_for_ready=True)
         for p in pools.pools:
             uri = "pool://{0}/{1}".format(self.ip_v4, p.name)
             uris.append(uri)
@@ -215,8 +239,8 @@ class MayastorHandle(object):
 
     def stat_nvme_controllers(self):
         """Statistics for all nvmx controllers"""
-        return self.ms.StatNvmeControllers(pb.Null()).controllers
+        return self.ms.StatNvmeControllers(NULL).controllers
 
     def mayastor_info(self):
         """Get information about Mayastor instance"""
-        return self.ms.GetMayastorInfo(pb.Null())
+        return self.ms.GetMayastorInfo(NULL)
@@ -1,7 +1,9 @@
 "Default fixtures that are considered to be reusable."
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from common.hdl import MayastorHandle
 from common.command import run_cmd
+from common.channel import ready_channels
 
 pytest_plugins = ["docker_compose"]
 
@@ -13,50 +15,58 @@ def check_size(prev, current, delta):
     assert delta == (before - after) >> 20
 
 
+def concurrently(fn, items):
+    "Apply fn to each of the items in parallel, returning a dict of the results."
+    items = list(items)
+    if not items:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(items)) as executor:
+        return dict(zip(items, executor.map(fn, items)))
+
+
+def mayastor_handles(containers, handle, renew=False):
+    """Create a gRPC handle of the given class for each mayastor container.
+    Set renew for containers that were restarted, their cached channels would
+    otherwise be stuck in reconnect backoff."""
+    ips = {
+        name: container.get("NetworkSettings.Networks.mayastor_net.IPAddress")
+        for name, container in containers.items()
+    }
+    # Connect to all instances at once, the handles then reuse the channels.
+    ready_channels(["%s:10124" % ip for ip in ips.values()], renew)
+    # The handles block on their readiness check, so create them in parallel.
+    return concurrently(lambda name: handle(ips[name]), ips)
+
+
 @pytest.fixture(scope="function")
 def containers(docker_project, function_scoped_container_getter):
     "Fixture to get handles to mayastor containers."
-    containers = {}
-    for name in docker_project.service_names:
-        containers[name] = function_scoped_container_getter.get(name)
-    yield containers
+    yield concurrently(
+        function_scoped_container_getter.get, docker_project.service_names
+    )
 
 
 @pytest.fixture(scope="function")
 def mayastors(docker_project, containers):
     "Fixture to get a reference to mayastor gRPC handles"
-    handles = {}
-    for name, container in containers.items():
-        handles[name] = MayastorHandle(
-            container.get("NetworkSettings.Networks.mayastor_net.IPAddress")
-        )
-    yield handles
+    yield mayastor_handles(containers, MayastorHandle, renew=True)
 
 
 @pytest.fixture(scope="function")
 def create_temp_files(containers):
     "Create temp files for each run so we start out clean."
-    for name in containers.keys():
-        run_cmd(f"rm -f /tmp/{name}.img", True)
-    for name in containers.keys():
-        run_cmd(f"truncate -s 1G /tmp/{name}.img", True)
+    files = [f"/tmp/{name}.img" for name in containers.keys()]
+    run_cmd(["rm", "-f"] + files, True)
+    run_cmd(["truncate", "-s", "1G"] + files, True)
 
 
 @pytest.fixture(scope="module")
 def container_mod(docker_project, module_scoped_container_getter):
     "Fixture to get handles to mayastor containers."
-    containers = {}
-    for name in docker_project.service_names:
-        containers[name] = module_scoped_container_getter.get(name)
-    yield containers
+    yield concurrently(module_scoped_container_getter.get, docker_project.service_names)
 
 
 @pytest.fixture(scope="module")
 def mayastor_mod(docker_project, container_mod):
     "Fixture to get a reference to mayastor gRPC handles."
-    handles = {}
-    for name, container in container_mod.items():
-        handles[name] = MayastorHandle(
-            container.get("NetworkSettings.Networks.mayastor_net.IPAddress")
-        )
-    yield handles
+    yield mayastor_handles(container_mod, MayastorHandle)
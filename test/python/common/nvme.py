@@ -1,155 +1,330 @@
+from functools import lru_cache
 from urllib.parse import urlparse
+import asyncio
+import glob
+import os
+import shlex
 import subprocess
 import time
-import json
 import re
 from common.command import run_cmd_async_at
 
+try:
+    # orjson parses nvme-cli output considerably faster, and directly from bytes.
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+# The same URIs are parsed again for each of connect, discover and disconnect.
+_parse = lru_cache(maxsize=256)(urlparse)
+
+# Number of I/O queues per controller. The kernel otherwise creates one per CPU,
+# each with its own TCP connection, which makes connecting slow on large hosts.
+# Set MAYASTOR_TEST_NVME_QUEUES=0 to get the kernel default, e.g. for tests
+# exercising the multi-queue paths.
+NR_IO_QUEUES = int(os.environ.get("MAYASTOR_TEST_NVME_QUEUES", "4"))
+
+# How long an nvme command may take before the test fails, rather than hanging
+# on an unresponsive target.
+NVME_TIMEOUT = float(os.environ.get("MAYASTOR_TEST_NVME_TIMEOUT", "15"))
+
+# Block devices of namespaces, as opposed to the hidden per-path devices
+# (nvmeXcYnZ) of multipath subsystems.
+NS_DEVICE = re.compile(r"nvme\d+n\d+")
+
+# Lists the NQN of each subsystem followed by its namespaces, which are found
+# under the subsystem with native multipath and under its controllers otherwise.
+SYSFS_LIST = (
+    "for s in /sys/class/nvme-subsystem/*; do "
+    'echo "subsysnqn $(cat $s/subsysnqn)"; ls $s $s/nvme*/ 2>/dev/null; '
+    "done; true"
+)
+
+
+def sysfs_wait(nqns, timeout=2.0, interval=0.05):
+    """Shell snippet waiting up to timeout for the subsystems of the given
+    NQNs to show up in sysfs, followed by SYSFS_LIST."""
+    checks = " && ".join(
+        "grep -qxF {} /sys/class/nvme-subsystem/*/subsysnqn".format(shlex.quote(nqn))
+        for nqn in nqns
+    )
+    loop = "for i in $(seq 1 {}); do ({}) 2>/dev/null && break; sleep {}; done; "
+    return loop.format(int(timeout / interval), checks, interval) + SYSFS_LIST
+
+
+class NvmeOpTimeout(TimeoutError):
+    """An nvme command did not complete within NVME_TIMEOUT."""
+
+    def __init__(self, command, remote=None):
+        self.command = command
+        self.remote = remote
+        where = "" if remote is None else " on {}".format(remote)
+        super().__init__(
+            "Command {}{} timed out after {}s".format(command, where, NVME_TIMEOUT)
+        )
+
+
+def nvme_run(command, **kwargs):
+    """Run the command on this host, raising NvmeOpTimeout after NVME_TIMEOUT."""
+    try:
+        return subprocess.run(command, check=True, timeout=NVME_TIMEOUT, **kwargs)
+    except subprocess.TimeoutExpired:
+        raise NvmeOpTimeout(command) from None
+
+
+async def nvme_remote_run(remote, command):
+    """Run the command on the remote host, raising NvmeOpTimeout after
+    NVME_TIMEOUT."""
+    try:
+        return await run_cmd_async_at(remote, command, timeout=NVME_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise NvmeOpTimeout(command, remote) from None
+
+
+def nvme_sysfs_device(nqn):
+    """Return the device path of the subsystem's namespace as found in sysfs,
+    or None if the subsystem is not connected (yet)."""
+    for subsys in glob.glob("/sys/class/nvme-subsystem/*"):
+        try:
+            with open(f"{subsys}/subsysnqn") as f:
+                if f.read().strip() != nqn:
+                    continue
+            entries = os.listdir(subsys)
+            for ctrl in glob.glob(f"{subsys}/nvme*/"):
+                entries += os.listdir(ctrl)
+        except FileNotFoundError:
+            continue
+        namespaces = sorted(filter(NS_DEVICE.fullmatch, entries))
+        if namespaces:
+            return "/dev/{}".format(namespaces[0])
+    return None
+
+
+def nvme_sysfs_parse(output):
+    """Map subsystem NQNs to the device paths of their namespaces, from the
+    output of SYSFS_LIST."""
+    devices = {}
+    nqn = None
+    for line in output.splitlines():
+        if line.startswith("subsysnqn "):
+            nqn = line[len("subsysnqn ") :].strip()
+        elif nqn is not None and nqn not in devices:
+            namespaces = sorted(filter(NS_DEVICE.fullmatch, line.split()))
+            if namespaces:
+                devices[nqn] = "/dev/{}".format(namespaces[0])
+    return devices
+
+
+def nvme_connect_cmd(host, port, nqn):
+    """Argument list to connect to the subsystem over TCP."""
+    command = [
+        "sudo",
+        "nvme",
+        "connect",
+        "-t",
+        "tcp",
+        "-s",
+        str(port),
+        "-a",
+        host,
+        "-n",
+        nqn,
+    ]
+    if NR_IO_QUEUES > 0:
+        command += ["-i", str(NR_IO_QUEUES)]
+    return command
+
 
 async def nvme_remote_connect_all(remote, host, port):
-    command = f"sudo nvme connect-all -t tcp -s {port} -a {host}"
-    await run_cmd_async_at(remote, command)
+    command = ["sudo", "nvme", "connect-all", "-t", "tcp", "-s", str(port), "-a", host]
+    if NR_IO_QUEUES > 0:
+        command += ["-i", str(NR_IO_QUEUES)]
+    await nvme_remote_run(remote, command)
+
+
+async def nvme_remote_devices(remote, nqns, wait=False):
+    """Return the device paths of the given NQNs on the remote host, or None
+    if any of them is not connected (yet). With wait, the remote host waits
+    for the subsystems to show up before listing them."""
+    command = sysfs_wait(nqns) if wait else SYSFS_LIST
+    output = await nvme_remote_run(remote, command)
+    found = nvme_sysfs_parse(output.stdout)
+
+    devices = [found.get(nqn) for nqn in nqns]
+    if None in devices:
+        return None
+
+    return devices
+
+
+async def nvme_remote_wait_devices(remote, nqns, attempts=3):
+    """Wait for the devices of the given NQNs to show up on the remote host.
+    The waiting happens remotely, so this usually takes a single round trip."""
+    for _ in range(attempts):
+        devices = await nvme_remote_devices(remote, nqns, wait=True)
+        if devices is not None:
+            return devices
+        await asyncio.sleep(0.05)
+
+    assert False, "devices for {} did not show up on {}".format(nqns, remote)
 
 
 async def nvme_remote_connect(remote, uri):
     """Connect to the remote nvmf target on this host."""
-    u = urlparse(uri)
+    u = _parse(uri)
     port = u.port
     host = u.hostname
     nqn = u.path[1:]
 
-    command = "sudo nvme connect -t tcp -s {0} -a {1} -n {2}".format(port, host, nqn)
+    # Connect and wait for the device within the same remote command, saving a
+    # round trip. Without a device (yet), fall back to waiting separately.
+    command = "{} && {{ {}; }}".format(
+        shlex.join(nvme_connect_cmd(host, port, nqn)), sysfs_wait([nqn])
+    )
+    output = await nvme_remote_run(remote, command)
+    device = nvme_sysfs_parse(output.stdout).get(nqn)
+    if device is None:
+        device = (await nvme_remote_wait_devices(remote, [nqn]))[0]
+
+    return device
 
-    await run_cmd_async_at(remote, command)
-    time.sleep(1)
-    command = "sudo nvme list -v -o json"
 
-    discover = await run_cmd_async_at(remote, command)
-    discover = json.loads(discover.stdout)
+async def nvme_remote_connect_many(remote, uris, connect_all=False):
+    """Connect to several remote nvmf targets on this host, returning the
+    device paths in the order of the given URIs.
 
-    dev = list(filter(lambda d: nqn in d.get("SubsystemNQN"), discover.get("Devices")))
+    With connect_all, a single connect-all is issued per target (host, port),
+    which also connects any other subsystem exported by that target.
+    Otherwise the individual connects are issued concurrently."""
+    parsed = [_parse(uri) for uri in uris]
+    nqns = [u.path[1:] for u in parsed]
 
-    # we should only have one connection
-    assert len(dev) == 1
-    dev_path = dev[0].get("Controllers")[0].get("Namespaces")[0].get("NameSpace")
+    if connect_all:
+        targets = {(u.hostname, u.port) for u in parsed}
+        await asyncio.gather(
+            *(nvme_remote_connect_all(remote, h, p) for h, p in targets)
+        )
+    else:
+        await asyncio.gather(
+            *(
+                nvme_remote_run(remote, nvme_connect_cmd(u.hostname, u.port, nqn))
+                for u, nqn in zip(parsed, nqns)
+            )
+        )
 
-    return f"/dev/{dev_path}"
+    return await nvme_remote_wait_devices(remote, nqns)
 
 
 async def nvme_remote_disconnect(remote, uri):
     """Disconnect the given URI on this host."""
-    u = urlparse(uri)
+    u = _parse(uri)
     nqn = u.path[1:]
 
-    command = "sudo nvme disconnect -n {0}".format(nqn)
-    await run_cmd_async_at(remote, command)
+    command = ["sudo", "nvme", "disconnect", "-n", nqn]
+    await nvme_remote_run(remote, command)
+
+
+def nvme_discover_cmd(host, port):
+    """Argument list to discover the subsystems of the target over TCP."""
+    command = ["sudo", "nvme", "discover", "-t", "tcp", "-s", str(port), "-a", host]
+    return command + ["-o", "json"]
+
+
+def nvme_check_discovered(output, nqn):
+    """Raise unless the subsystem is among the records of the discover output."""
+    records = json_loads(output).get("records", [])
+    if not any(r.get("subnqn") == nqn for r in records):
+        raise ValueError("uri {} is not discovered".format(nqn))
 
 
 async def nvme_remote_discover(remote, uri):
     """Discover target."""
-    u = urlparse(uri)
-    port = u.port
-    host = u.hostname
-
-    command = "sudo nvme discover -t tcp -s {0} -a {1}".format(port, host)
-    output = await run_cmd_async_at(remote, command).stdout
-    if not u.path[1:] in str(output.stdout):
-        raise ValueError("uri {} is not discovered".format(u.path[1:]))
+    u = _parse(uri)
+    output = await nvme_remote_run(remote, nvme_discover_cmd(u.hostname, u.port))
+    nvme_check_discovered(output.stdout, u.path[1:])
+
+
+def nvme_wait_device(nqn, timeout=5.0, interval=0.05):
+    """Wait for a namespace of the given subsystem to show up in sysfs and
+    return its device path."""
+    deadline = time.monotonic() + timeout
+    device = nvme_sysfs_device(nqn)
+    while device is None:
+        assert time.monotonic() < deadline, f"device for {nqn} did not show up"
+        time.sleep(interval)
+        device = nvme_sysfs_device(nqn)
+    return device
 
 
 def nvme_connect(uri, delay=10, tmo=600):
-    u = urlparse(uri)
+    u = _parse(uri)
     port = u.port
     host = u.hostname
     nqn = u.path[1:]
 
-    command = (
-        f"sudo nvme connect -t tcp -s {port} -a {host} -n {nqn} -c {delay} -l {tmo}"
-    )
-    subprocess.run(command, check=True, shell=True, capture_output=False)
-    time.sleep(1)
-    command = "sudo nvme list -v -o json"
-    discover = json.loads(
-        subprocess.run(
-            command, shell=True, check=True, text=True, capture_output=True
-        ).stdout
-    )
-
-    dev = list(filter(lambda d: nqn in d.get("SubsystemNQN"), discover.get("Devices")))
-
-    # we should only have one connection
-    assert len(dev) == 1
-    device = "/dev/{}".format(dev[0]["Namespaces"][0].get("NameSpace"))
-    return device
+    command = nvme_connect_cmd(host, port, nqn) + ["-c", str(delay), "-l", str(tmo)]
+    nvme_run(command)
+    return nvme_wait_device(nqn)
 
 
 def nvme_id_ctrl(device):
     """Identify controller."""
-    command = "sudo nvme id-ctrl {0} -o json".format(device)
-    id_ctrl = json.loads(
-        subprocess.run(
-            command, shell=True, check=True, text=True, capture_output=True
-        ).stdout
-    )
+    command = ["sudo", "nvme", "id-ctrl", device, "-o", "json"]
+    id_ctrl = json_loads(nvme_run(command, capture_output=True).stdout)
 
     return id_ctrl
 
 
 def nvme_resv_report(device):
     """Reservation report."""
-    command = "sudo nvme resv-report {0} -c 1 -o json".format(device)
-    resv_report = json.loads(
-        subprocess.run(
-            command, shell=True, check=True, text=True, capture_output=True
-        ).stdout
-    )
+    command = ["sudo", "nvme", "resv-report", device, "-c", "1", "-o", "json"]
+    resv_report = json_loads(nvme_run(command, capture_output=True).stdout)
 
     return resv_report
 
 
 def nvme_discover(uri):
     """Discover target."""
-    u = urlparse(uri)
-    port = u.port
-    host = u.hostname
-
-    command = "sudo nvme discover -t tcp -s {0} -a {1}".format(port, host)
-    output = subprocess.run(
-        command, check=True, shell=True, capture_output=True, encoding="utf-8"
-    )
-    if not u.path[1:] in str(output.stdout):
-        raise ValueError("uri {} is not discovered".format(u.path[1:]))
+    u = _parse(uri)
+    command = nvme_discover_cmd(u.hostname, u.port)
+    output = nvme_run(command, capture_output=True)
+    nvme_check_discovered(output.stdout, u.path[1:])
 
 
 def nvme_disconnect(uri):
     """Disconnect the given URI on this host."""
-    u = urlparse(uri)
+    u = _parse(uri)
     nqn = u.path[1:]
 
-    command = "sudo nvme disconnect -n {0}".format(nqn)
-    subprocess.run(command, check=True, shell=True, capture_output=True)
+    command = ["sudo", "nvme", "disconnect", "-n", nqn]
+    nvme_run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
 
 
 def nvme_disconnect_controller(name):
     """Disconnect the given NVMe controller on this host."""
-    command = "sudo nvme disconnect -d {0}".format(name)
-    subprocess.run(command, check=True, shell=True, capture_output=True)
+    command = ["sudo", "nvme", "disconnect", "-d", name]
+    nvme_run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
 
 
 def nvme_disconnect_all():
     """Disconnect from all connected nvme subsystems"""
-    command = "sudo nvme disconnect-all"
-    subprocess.run(command, check=True, shell=True, capture_output=True)
+    try:
+        with os.scandir("/sys/class/nvme-subsystem") as it:
+            if not any(it):
+                return
+    except FileNotFoundError:
+        # The nvme modules are not even loaded, so nothing is connected.
+        return
+
+    command = ["sudo", "nvme", "disconnect-all"]
+    nvme_run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
 
 
 def nvme_list_subsystems(device):
     """Retrieve information for NVMe subsystems"""
-    command = "sudo nvme list-subsys {} -o json".format(device)
-    return json.loads(
-        subprocess.run(
-            command, check=True, shell=True, capture_output=True, encoding="utf-8"
-        ).stdout
-    )
+    command = ["sudo", "nvme", "list-subsys", device, "-o", "json"]
+    return json_loads(nvme_run(command, capture_output=True).stdout)
 
 
 NS_PROPS = ["nguid", "eui64"]
@@ -157,17 +332,10 @@ NS_PROPS = ["nguid", "eui64"]
 
 def identify_namespace(device):
     """Get properties of a namespace on this host"""
-    command = "sudo nvme id-ns {}".format(device)
-    output = subprocess.run(
-        command, check=True, shell=True, capture_output=True, encoding="utf-8"
-    )
-    props = output.stdout.strip().split("\n")[1:]
-    ns = {}
-    for p in props:
-        v = [v.strip() for v in p.split(":") if p.count(":") == 1]
-        if len(v) == 2 and v[0] in NS_PROPS:
-            ns[v[0]] = v[1]
-    return ns
+    command = ["sudo", "nvme", "id-ns", device, "-o", "json"]
+    id_ns = json_loads(nvme_run(command, capture_output=True).stdout)
+    # nvme-cli reports both as hex strings, the same as in its text output.
+    return {p: id_ns[p] for p in NS_PROPS if p in id_ns}
 
 
 def nvme_delete_controller(device):
@@ -183,7 +351,7 @@ def nvme_delete_controller(device):
 
     # Forcibly trigger controller removal. Note that operations must be executed
     # with root privileges, hence sudo for python interpreter.
-    script = "\"f = open('%s', 'w'); f.write('1'); f.flush()\"" % p
+    script = "f = open('%s', 'w'); f.write('1'); f.flush()" % p
     # Run privileged Python script.
-    command = "sudo python -c {} ".format(script)
-    subprocess.run(command, check=True, shell=True, capture_output=True)
+    command = ["sudo", "python", "-c", script]
+    nvme_run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
@@ -0,0 +1,21 @@
+"""Rebuild helpers working with both the v0 and v1 gRPC handles."""
+import grpc
+from retrying import retry
+
+
+@retry(wait_fixed=20, stop_max_delay=5000)
+def wait_rebuild_state(handle, nexus_uuid, child_uri, state):
+    "Wait for the rebuild to reach the state, None once the job is gone."
+    assert handle.rebuild_state(nexus_uuid, child_uri) == state
+
+
+def cancel_rebuild(handle, nexus_uuid, child_uri):
+    """Stop the rebuild to the child if there is one, and wait for the job to
+    go away. Removing the child alone only cancels the jobs it is the source
+    of, the job to it would keep running."""
+    try:
+        handle.rebuild_stop(nexus_uuid, child_uri)
+    except grpc.RpcError as error:
+        if error.code() != grpc.StatusCode.NOT_FOUND:
+            raise
+    wait_rebuild_state(handle, nexus_uuid, child_uri, None)
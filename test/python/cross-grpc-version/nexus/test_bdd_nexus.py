@@ -1,11 +1,10 @@
 import pytest
-from pytest_bdd import given, scenario, then, when, parsers
+from pytest_bdd import given, scenarios, then, when, parsers
 
 from collections import namedtuple
-import subprocess
 
-from common.mayastor import container_mod, mayastor_mod
-from v1.mayastor import container_mod as v1_container_mod
+from common.command import create_local_files, remove_local_files
+from common.mayastor import concurrently, container_mod, mayastor_mod
 from v1.mayastor import mayastor_mod as v1_mayastor_mod
 from common.volume import Volume as v0_volume
 from v1.volume import Volume as v1_volume
@@ -20,98 +19,7 @@ BaseBdev = namedtuple("BaseBdev", "name uri")
 LocalFile = namedtuple("LocalFile", "path uri")
 
 
-@scenario("features/nexus.feature", "creating the same nexus with v1 gRPC call")
-def test_creating_the_same_nexus_with_v1_gRPC_call():
-    """creating the same nexus with v1 gRPC call."""
-
-
-@scenario("features/nexus.feature", "destroying a v0 version nexus with v1 gRPC call")
-def test_destroying_a_v0_version_nexus_with_v1_gRPC_call():
-    """destroying a v0 version nexus with v1 gRPC call."""
-
-
-@scenario(
-    "features/nexus.feature", "destroying a v0 version nexus without first unpublishing"
-)
-def test_destroying_a_v0_version_nexus_without_first_unpublishing():
-    """destroying a v0 version nexus without first unpublishing."""
-
-
-@scenario("features/nexus.feature", "destroying a v0 version nexus that does not exist")
-def test_destroying_a_v0_version_nexus_that_does_not_exist():
-    """destroying a v0 version nexus that does not exist."""
-
-
-@scenario(
-    "features/nexus.feature",
-    "listing nexuses created with v0 version using v1 gRPC call",
-)
-def test_listing_nexuses_created_with_v0_version_using_v1_gRPC_call():
-    """listing nexuses created with v0 version using v1 gRPC call."""
-
-
-@scenario("features/nexus.feature", "listing v0 nexus by name which does not exists")
-def test_listing_v0_nexus_by_name_which_does_not_exists():
-    """listing v0 nexus by name which does not exists."""
-
-
-@scenario(
-    "features/nexus.feature",
-    "removing a child from a v0 version nexus using v1 gRPC call",
-)
-def test_removing_a_child_from_a_v0_version_nexus_using_v1_gRPC_call():
-    """removing a child from a v0 version nexus using v1 gRPC call."""
-
-
-@scenario(
-    "features/nexus.feature", "adding a child to a v0 version nexus using v1 gRPC call"
-)
-def test_adding_a_child_to_a_v0_version_nexus_using_v1_gRPC_call():
-    """adding a child to a v0 version nexus using v1 gRPC call."""
-
-
-@scenario("features/nexus.feature", "publishing a v0 version nexus using v1 gRPC call")
-def test_publishing_a_v0_version_nexus_using_v1_gRPC_call():
-    """publishing a v0 version nexus using v1 RPC call."""
-
-
-@scenario(
-    "features/nexus.feature", "unpublishing a v0 version nexus using v1 gRPC call"
-)
-def test_unpublishing_a_v0_version_nexus_using_v1_gRPC_call():
-    """unpublishing a v0 version nexus using v1 gRPC call."""
-
-
-@scenario(
-    "features/nexus.feature",
-    "unpublishing a v0 version nexus using v1 gRPC call that is not published",
-)
-def test_unpublishing_a_v0_version_nexus_using_v1_gRPC_call_that_is_not_published():
-    """unpublishing a v0 version nexus using v1 gRPC call that is not published."""
-
-
-@scenario(
-    "features/nexus.feature",
-    "republishing a v0 version nexus with the same protocol using v1 gRPC call",
-)
-def test_republishing_a_v0_version_nexus_with_the_same_protocol_using_v1_gRPC_call():
-    """republishing a v0 version nexus with the same protocol using v1 gRPC call."""
-
-
-@scenario(
-    "features/nexus.feature",
-    "republishing a v0 version nexus with a different protocol using v1 gRPC call",
-)
-def test_fail_republishing_a_v0_version_nexus_with_a_different_protocol_using_v1_gRPC_call():
-    """republishing a v0 version nexus with a different protocol using v1 gRPC call."""
-
-
-@scenario(
-    "features/nexus.feature",
-    "publishing a v0 version nexus with a crypto-key using v1 gRPC call",
-)
-def test_publishing_a_v0_version_nexus_with_a_cryptokey_using_v1_gRPC_call():
-    """publishing a v0 version nexus with a crypto-key using v1 gRPC call."""
+scenarios("features/nexus.feature")
 
 
 @pytest.fixture(scope="module")
@@ -158,21 +66,25 @@ def nexus_info_key():
     return "0"
 
 
+SHARE_TYPES = {
+    "nbd": pb.ShareProtocolNexus.NEXUS_NBD,
+    "nvmf": pb.ShareProtocolNexus.NEXUS_NVMF,
+    "iscsi": pb.ShareProtocolNexus.NEXUS_ISCSI,
+}
+
+
 def share_type(protocol):
-    TYPES = {
-        "nbd": pb.ShareProtocolNexus.NEXUS_NBD,
-        "nvmf": pb.ShareProtocolNexus.NEXUS_NVMF,
-        "iscsi": pb.ShareProtocolNexus.NEXUS_ISCSI,
-    }
-    return TYPES[protocol]
+    return SHARE_TYPES[protocol]
+
+
+PROTOCOLS = {
+    "none": common_pb.NONE,
+    "nvmf": common_pb.NVMF,
+    "iscsi": common_pb.ISCSI,
+}
 
 
 def share_protocol(name):
-    PROTOCOLS = {
-        "none": common_pb.NONE,
-        "nvmf": common_pb.NVMF,
-        "iscsi": common_pb.ISCSI,
-    }
     return PROTOCOLS[name]
 
 
@@ -182,14 +94,18 @@ def get_child_uris(nexus):
 
 @pytest.fixture(scope="module")
 def base_bdevs(mayastor_mod, base_instances):
-    devices = {}
-    for instance in base_instances:
-        uri = "malloc:///malloc0?size_mb=64&blk_size=4096"
-        name = mayastor_mod[instance].bdev.Create(pb.BdevUri(uri=uri)).name
-        devices[instance] = BaseBdev(name, uri)
+    uri = "malloc:///malloc0?size_mb=64&blk_size=4096"
+    # Each instance gets its own bdev, so they are created in parallel.
+    names = concurrently(
+        lambda instance: mayastor_mod[instance].bdev.Create(pb.BdevUri(uri=uri)).name,
+        base_instances,
+    )
+    devices = {instance: BaseBdev(name, uri) for instance, name in names.items()}
     yield devices
-    for instance, bdev in devices.items():
-        mayastor_mod[instance].bdev.Destroy(pb.BdevUri(uri=bdev.uri))
+    concurrently(
+        lambda instance: mayastor_mod[instance].bdev.Destroy(pb.BdevUri(uri=uri)),
+        devices,
+    )
 
 
 @pytest.fixture(scope="module")
@@ -214,15 +130,11 @@ def local_files(file_types):
     files = {}
     for type in file_types:
         path = f"/tmp/{type}-file.img"
-        uri = f"{type}://{path}?blk_size=4096"
-        subprocess.run(
-            ["sudo", "sh", "-c", f"rm -f '{path}' && truncate -s 64M '{path}'"],
-            check=True,
-        )
-        files[type] = LocalFile(path, uri)
+        files[type] = LocalFile(path, f"{type}://{path}?blk_size=4096")
+    paths = [file.path for file in files.values()]
+    create_local_files(paths, megabytes(64))
     yield files
-    for path in [file.path for file in files.values()]:
-        subprocess.run(["sudo", "sh", "-c", f"rm -f '{path}'"], check=True)
+    remove_local_files(paths)
 
 
 @pytest.fixture(scope="module")
@@ -466,9 +378,8 @@ def unpublish_nexus(v1_mayastor_mod, nexus_instance, nexus_uuid):
 
 @when("publishing the nexus with the same protocol")
 def publishing_the_nexus_with_the_same_protocol(
-    find_nexus, v1_mayastor_mod, nexus_instance, nexus_uuid
+    v1_mayastor_mod, nexus_instance, nexus_uuid
 ):
-    nexus = find_nexus(nexus_uuid)
     v1_mayastor_mod[nexus_instance].nexus_rpc.PublishNexus(
         nexus_pb.PublishNexusRequest(uuid=nexus_uuid, key="", share=common_pb.NVMF)
     )
@@ -476,9 +387,8 @@ def publishing_the_nexus_with_the_same_protocol(
 
 @when("attempting to publish the nexus with a different protocol")
 def attempt_to_publish_nexus_with_different_protocol(
-    find_nexus, v1_mayastor_mod, nexus_instance, nexus_uuid
+    v1_mayastor_mod, nexus_instance, nexus_uuid
 ):
-    nexus = find_nexus(nexus_uuid)
     with pytest.raises(grpc.RpcError) as error:
         v1_mayastor_mod[nexus_instance].nexus_rpc.PublishNexus(
             nexus_pb.PublishNexusRequest(uuid=nexus_uuid, key="", share=common_pb.NONE)
@@ -514,7 +424,7 @@ def operation_should_succeed():
 
 @then("the nexus should appear in the output list")
 def nexus_should_appear_in_output(nexus_uuid, list_nexuses):
-    assert nexus_uuid in [nexus.uuid for nexus in list_nexuses]
+    assert nexus_uuid in {nexus.uuid for nexus in list_nexuses}
 
 
 @then("no nexus should appear in the output list")
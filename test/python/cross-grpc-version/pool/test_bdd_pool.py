@@ -4,15 +4,15 @@ import pytest
 
 from pytest_bdd import (
     given,
-    scenario,
+    scenarios,
     then,
     when,
     parsers,
 )
 
 from common.mayastor import container_mod, mayastor_mod
-from v1.mayastor import container_mod as container_mod_v1
 from v1.mayastor import mayastor_mod as mayastor_mod_v1
+from common.channel import rpc_future
 
 import grpc
 import mayastor_pb2 as pb
@@ -32,59 +32,20 @@ def v1_mayastor_instance(mayastor_mod_v1):
     return mayastor_mod_v1["ms0"]
 
 
-@scenario(
-    "features/pool.feature",
-    "creating a v1 version pool with a v0 version pool name that already exists",
-)
-def test_creating_a_v1_version_pool_with_a_v0_version_pool_name_that_already_exists():
-    """creating a v1 version pool with a v0 version pool name that already exists."""
-
-
-@scenario(
-    "features/pool.feature",
-    "creating a v1 version pool with same name and different disk of existing v0 version pool",
-)
-def test_creating_a_v1_version_pool_with_same_name_and_different_disk_of_existing_v0_version_pool():
-    """creating a v1 version pool with same name and different disk of existing v0 version pool"""
-
-
-@scenario(
-    "features/pool.feature", "listing pools created with v0 version using v1 grpc call"
-)
-def test_listing_pools_created_with_v0_version_using_v1_grpc_call():
-    """listing pools created with v0 version using v1 gRPC call."""
-
-
-@scenario(
-    "features/pool.feature",
-    "listing pool by name created with v0 version using v1 grpc call",
-)
-def test_listing_pool_by_name_created_with_v0_version_using_v1_grpc_call():
-    """listing pool by name created with v0 version using v1 gRPC call."""
-
-
-@scenario(
-    "features/pool.feature",
-    "listing v0 pool by name which does not exists using v1 grpc call",
-)
-def test_listing_v0_pool_by_name_which_does_not_exists_using_v1_grpc_call():
-    """listing v0 pool by name which does not exists using v1 grpc call."""
-
-
-@scenario(
-    "features/pool.feature",
-    "destroying a pool created with v0 version using v1 grpc call",
-)
-def test_destroying_a_pool_created_with_v0_version_using_v1_grpc_call():
-    """destroying a pool created with v0 version using v1 grpc call."""
+scenarios("features/pool.feature")
 
 
 @pytest.fixture
 def v0_replica_pools(get_mayastor_instance):
     pools = {}
     yield pools
-    for name in pools.keys():
-        get_mayastor_instance.ms.DestroyPool(pb.DestroyPoolRequest(name=name))
+    # Destroy the pools concurrently, waiting for all of them at the end.
+    futures = [
+        rpc_future(get_mayastor_instance.ms.DestroyPool, pb.DestroyPoolRequest(name=n))
+        for n in pools.keys()
+    ]
+    for future in futures:
+        future.result()
 
 
 @pytest.fixture
@@ -102,15 +63,20 @@ def create_v0_pool(get_mayastor_instance, v0_replica_pools):
 def v1_replica_pools(v1_mayastor_instance):
     pools = {}
     yield pools
+    # List all pools once, then destroy those still present concurrently.
+    existing = {
+        pool.name: pool
+        for pool in v1_mayastor_instance.pool_rpc.ListPools(pb2.ListPoolOptions()).pools
+    }
+    futures = []
     for name in pools.keys():
-        opts = pb2.ListPoolOptions()
-        opts.name.value = name
-        pools = v1_mayastor_instance.pool_rpc.ListPools(opts).pools
-        if len(pools) != 0:
+        if name in existing:
             opts = pb2.DestroyPoolRequest()
-            opts.name = pools[0].name
-            opts.uuid.value = pools[0].uuid
-            v1_mayastor_instance.pool_rpc.DestroyPool(opts)
+            opts.name = existing[name].name
+            opts.uuid.value = existing[name].uuid
+            futures.append(rpc_future(v1_mayastor_instance.pool_rpc.DestroyPool, opts))
+    for future in futures:
+        future.result()
 
 
 @pytest.fixture
@@ -128,12 +94,11 @@ def create_v1_pool(v1_mayastor_instance, v1_replica_pools):
 @pytest.fixture
 def find_pool(v1_mayastor_instance):
     def find(name):
-        for pool in v1_mayastor_instance.pool_rpc.ListPools(
-            pb2.ListPoolOptions()
-        ).pools:
-            if pool.name == name:
-                return pool
-        return None
+        # Let the server filter by name, it returns at most one pool.
+        opts = pb2.ListPoolOptions()
+        opts.name.value = name
+        pools = v1_mayastor_instance.pool_rpc.ListPools(opts).pools
+        return pools[0] if pools else None
 
     yield find
 
@@ -212,14 +177,14 @@ def the_pool_create_request_should_fail(create_pool_with_same_name_different_dis
 
 @then("the pool should appear in the output list")
 def pool_should_appear_in_output(get_pool_name, list_pools):
-    assert get_pool_name in [pool.name for pool in list_pools]
+    assert get_pool_name in {pool.name for pool in list_pools}
 
 
 @then("only the pool p0 should appear in the output list")
 def only_the_pool_p0_should_appear_in_the_output_list(list_existing_pool):
     pools = list_existing_pool
     assert len(pools) == 1
-    assert "p0" in [pool.name for pool in pools]
+    assert "p0" in {pool.name for pool in pools}
 
 
 @then("no pool should appear in the output list")
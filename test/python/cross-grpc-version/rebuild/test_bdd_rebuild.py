@@ -1,14 +1,13 @@
 import pytest
-from pytest_bdd import given, scenario, then, when, parsers
+from pytest_bdd import given, scenarios, then, when, parsers
 from retrying import retry
 
 import os
-import subprocess
-import time
 
+from common.command import create_local_files, remove_local_files
+from common.rebuild import cancel_rebuild, wait_rebuild_state
 from common.mayastor import container_mod, mayastor_mod
 from common.volume import Volume
-from v1.mayastor import container_mod as v1_container_mod
 from v1.mayastor import mayastor_mod as v1_mayastor_mod
 
 from v1.volume import Volume
@@ -25,14 +24,9 @@ def megabytes(n):
 @pytest.fixture(scope="module")
 def local_files():
     files = [f"/tmp/disk-rebuild-{base}.img" for base in ["source", "target"]]
-    for path in files:
-        subprocess.run(
-            ["sudo", "sh", "-c", f"rm -f '{path}' && truncate -s 64M '{path}'"],
-            check=True,
-        )
+    create_local_files(files, megabytes(64))
     yield
-    for path in files:
-        subprocess.run(["sudo", "rm", "-f", path], check=True)
+    remove_local_files(files)
 
 
 @pytest.fixture(scope="module")
@@ -57,24 +51,28 @@ def find_child(nexus, uri):
     return None
 
 
+NEXUS_STATES = {
+    "UNKNOWN": nexus_pb.NexusState.NEXUS_UNKNOWN,
+    "ONLINE": nexus_pb.NexusState.NEXUS_ONLINE,
+    "DEGRADED": nexus_pb.NexusState.NEXUS_DEGRADED,
+    "FAULTED": nexus_pb.NexusState.NEXUS_FAULTED,
+}
+
+
 def convert_nexus_state(state):
-    STATES = {
-        "UNKNOWN": nexus_pb.NexusState.NEXUS_UNKNOWN,
-        "ONLINE": nexus_pb.NexusState.NEXUS_ONLINE,
-        "DEGRADED": nexus_pb.NexusState.NEXUS_DEGRADED,
-        "FAULTED": nexus_pb.NexusState.NEXUS_FAULTED,
-    }
-    return STATES[state]
+    return NEXUS_STATES[state]
+
+
+CHILD_STATES = {
+    "UNKNOWN": pb.ChildState.CHILD_UNKNOWN,
+    "ONLINE": pb.ChildState.CHILD_ONLINE,
+    "DEGRADED": pb.ChildState.CHILD_DEGRADED,
+    "FAULTED": pb.ChildState.CHILD_FAULTED,
+}
 
 
 def convert_child_state(state):
-    STATES = {
-        "UNKNOWN": pb.ChildState.CHILD_UNKNOWN,
-        "ONLINE": pb.ChildState.CHILD_ONLINE,
-        "DEGRADED": pb.ChildState.CHILD_DEGRADED,
-        "FAULTED": pb.ChildState.CHILD_FAULTED,
-    }
-    return STATES[state]
+    return CHILD_STATES[state]
 
 
 @pytest.fixture(scope="module")
@@ -87,12 +85,14 @@ def v1_mayastor_instance(v1_mayastor_mod):
     yield v1_mayastor_mod["ms0"]
 
 
+CHILD_ACTIONS = {
+    "OFFLINE": nexus_pb.ChildAction.Offline,
+    "ONLINE": nexus_pb.ChildAction.Online,
+}
+
+
 def convert_child_action(state):
-    ACTIONS = {
-        "OFFLINE": nexus_pb.ChildAction.Offline,
-        "ONLINE": nexus_pb.ChildAction.Online,
-    }
-    return ACTIONS[state]
+    return CHILD_ACTIONS[state]
 
 
 def lookup_nexus(v1_mayastor_instance, nexus_uuid):
@@ -106,46 +106,16 @@ def lookup_nexus_child(v1_mayastor_instance, nexus_uuid, child_uri):
     nexus = lookup_nexus(v1_mayastor_instance, nexus_uuid)
     if nexus is None:
         return None
-    for child in nexus.children:
-        if child.uri == child_uri:
-            return child
-    return None
+    return find_child(nexus, child_uri)
 
 
-@retry(wait_fixed=100, stop_max_attempt_number=5)
+@retry(wait_exponential_multiplier=10, wait_exponential_max=100, stop_max_delay=500)
 def wait_child_state(v1_mayastor_instance, nexus_uuid, child_uri, state):
     child = lookup_nexus_child(v1_mayastor_instance, nexus_uuid, child_uri)
     assert child is not None and child.state == convert_child_state(state)
 
 
-@scenario("features/rebuild.feature", "running rebuild")
-def test_running_rebuild():
-    """Running rebuild."""
-
-
-@scenario("features/rebuild.feature", "stopping rebuild")
-def test_stopping_rebuild():
-    """Stopping rebuild."""
-
-
-@scenario("features/rebuild.feature", "pausing rebuild")
-def test_pausing_rebuild():
-    """Pausing rebuild."""
-
-
-@scenario("features/rebuild.feature", "resuming rebuild")
-def test_resuming_rebuild():
-    """Resuming rebuild."""
-
-
-@scenario("features/rebuild.feature", "setting a child ONLINE")
-def test_setting_a_child_online():
-    """Setting a child ONLINE."""
-
-
-@scenario("features/rebuild.feature", "setting a child OFFLINE")
-def test_setting_a_child_offline():
-    """Setting a child OFFLINE."""
+scenarios("features/rebuild.feature")
 
 
 @given("a mayastor instance")
@@ -160,7 +130,7 @@ def get_nexus(mayastor_nexus):
     pass
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mayastor_nexus(v0_mayastor_instance, nexus_uuid, source_uri):
     nexus = v0_mayastor_instance.ms.CreateNexus(
         pb.CreateNexusRequest(
@@ -171,6 +141,23 @@ def mayastor_nexus(v0_mayastor_instance, nexus_uuid, source_uri):
     v0_mayastor_instance.ms.DestroyNexus(pb.DestroyNexusRequest(uuid=nexus_uuid))
 
 
+@pytest.fixture(autouse=True)
+def reset_nexus_children(
+    v0_mayastor_instance, v1_mayastor_instance, mayastor_nexus, nexus_uuid, target_uri
+):
+    "Remove the target child after each scenario, leaving the nexus with its source."
+    yield
+    cancel_rebuild(v1_mayastor_instance, nexus_uuid, target_uri)
+    try:
+        v0_mayastor_instance.ms.RemoveChildNexus(
+            pb.RemoveChildNexusRequest(uuid=nexus_uuid, uri=target_uri)
+        )
+    except grpc.RpcError as error:
+        # The scenario did not get to add the target child.
+        if error.code() != grpc.StatusCode.NOT_FOUND:
+            raise
+
+
 @pytest.fixture(scope="module")
 def find_nexus(v0_mayastor_instance):
     def find(uuid):
@@ -216,7 +203,7 @@ def stop_rebuild(v1_mayastor_instance, mayastor_nexus, nexus_uuid, target_uri):
     v1_mayastor_instance.nexus_rpc.StopRebuild(
         nexus_pb.StopRebuildRequest(nexus_uuid=nexus_uuid, uri=target_uri)
     )
-    time.sleep(0.5)
+    wait_rebuild_state(v1_mayastor_instance, nexus_uuid, target_uri, None)
 
 
 @when("the rebuild operation is then paused")
@@ -224,7 +211,7 @@ def pause_rebuild(v1_mayastor_instance, mayastor_nexus, nexus_uuid, target_uri):
     v1_mayastor_instance.nexus_rpc.PauseRebuild(
         nexus_pb.PauseRebuildRequest(nexus_uuid=nexus_uuid, uri=target_uri)
     )
-    time.sleep(0.5)
+    wait_rebuild_state(v1_mayastor_instance, nexus_uuid, target_uri, "paused")
 
 
 @when(parsers.parse("the target child is set {state}"), target_fixture="set_child")
@@ -1,7 +1,7 @@
 import pytest
 from pytest_bdd import (
     given,
-    scenario,
+    scenarios,
     then,
     when,
     parsers,
@@ -19,103 +19,7 @@ import common_pb2 as common_pb
 import mayastor_pb2 as pb
 
 
-@scenario(
-    "features/replica.feature",
-    "creating a v1 version replica with a v0 version name that already exists",
-)
-def test_creating_a_v1_version_replica_with_a_v0_version_name_that_already_exists():
-    """creating a v1 version replica with a v0 version name that already exists."""
-
-
-@scenario(
-    "features/replica.feature",
-    "creating a v1 version replica with a v0 version uuid that already exists",
-)
-def test_creating_a_v1_version_replica_with_a_v0_version_uuid_that_already_exists():
-    """creating a v1 version replica with a v0 version uuid that already exists."""
-
-
-@scenario("features/replica.feature", "listing replicas")
-def test_listing_replicas():
-    """Listing replicas."""
-
-
-@scenario(
-    "features/replica.feature",
-    "listing v0 version replicas by replica name using v1 version gRPC call",
-)
-def test_listing_v0_version_replicas_by_replica_name_using_v1_version_gRPC_call():
-    """listing v0 version replicas by replica name using v1 version gRPC call."""
-
-
-@scenario(
-    "features/replica.feature",
-    "listing replicas by pool name on a pool with v0 version replicas",
-)
-def test_listing_replicas_by_pool_name_on_a_pool_with_v0_version_replicas():
-    """listing replicas by pool name on a pool with v0 version replicas."""
-
-
-@scenario(
-    "features/replica.feature",
-    "listing replicas by pool name with a non-existent pool name",
-)
-def test_listing_replicas_by_pool_name_with_a_non_existent_pool():
-    """Listing replicas by pool name with a non-existent pool name."""
-
-
-@scenario(
-    "features/replica.feature",
-    'sharing a v0 version replica over "nvmf" using v1 gRPC call',
-)
-def test_sharing_a_v0_version_replica_over_nvmf_using_v1_gRPC_call():
-    """sharing a v0 version replica over "nvmf" using v1 gRPC call."""
-
-
-@scenario(
-    "features/replica.feature",
-    'sharing a v0 version replica over "iscsi" using v1 gRPC call',
-)
-def test_fail_sharing_a_v0_version_replica_over_iscsi_using_v1_gRPC_call():
-    """sharing a v0 version replica over "iscsi" using v1 gRPC call."""
-
-
-@scenario(
-    "features/replica.feature",
-    "sharing a v0 version replica that is already shared with the same protocol using v1 gRPC call",
-)
-def test_sharing_a_v0_version_replica_that_is_already_shared_with_the_same_protocol_using_v1_gRPC_call():
-    """sharing a v0 version replica that is already shared with the same protocol using v1 gRPC call."""
-
-
-@scenario(
-    "features/replica.feature",
-    "sharing a v0 version replica that is already shared with a different protocol using v1 gRPC call",
-)
-def test_fail_sharing_a_v0_version_replica_that_is_already_shared_with_a_different_protocol_using_v1_gRPC_call():
-    """sharing a v0 version replica that is already shared with a different protocol using v1 gRPC call."""
-
-
-@scenario(
-    "features/replica.feature", "unsharing a v0 version replica using v1 gRPC call"
-)
-def test_unsharing_a_v0_version_replica_using_v1_gRPC_call():
-    """unsharing a v0 version replica using v1 gRPC call."""
-
-
-@scenario(
-    "features/replica.feature",
-    "unsharing a v0 version replica that is not shared using v1 gRPC call",
-)
-def test_unsharing_a_v0_version_replica_that_is_not_shared_using_v1_gRPC_call():
-    """unsharing a v0 version replica that is not shared using v1 gRPC call."""
-
-
-@scenario(
-    "features/replica.feature", "destroying a v0 version replica using v1 gRPC call"
-)
-def test_destroying_a_v0_version_replica_using_v1_gRPC_call():
-    """destroying a v0 version replica using v1 gRPC call."""
+scenarios("features/replica.feature")
 
 
 @pytest.fixture
@@ -133,12 +37,14 @@ def replica_size():
     yield 32 * 1024 * 1024
 
 
+PROTOCOLS = {
+    "none": common_pb.NONE,
+    "nvmf": common_pb.NVMF,
+    "iscsi": common_pb.ISCSI,
+}
+
+
 def share_protocol(name):
-    PROTOCOLS = {
-        "none": common_pb.NONE,
-        "nvmf": common_pb.NVMF,
-        "iscsi": common_pb.ISCSI,
-    }
     return PROTOCOLS[name]
 
 
@@ -202,10 +108,10 @@ def create_v1_replica(v1_mayastor_instance, mayastor_pool, current_replicas):
 @pytest.fixture
 def find_replica(v1_mayastor_instance, mayastor_pool):
     def find(name, uuid):
-        for replica in v1_mayastor_instance.replica_rpc.ListReplicas(
-            replica_pb.ListReplicaOptions()
-        ).replicas:
-            if replica.name == name and replica.uuid == uuid:
+        opts = replica_pb.ListReplicaOptions()
+        opts.name.value = name
+        for replica in v1_mayastor_instance.replica_rpc.ListReplicas(opts).replicas:
+            if replica.uuid == uuid:
                 return replica
         return None
 
@@ -371,12 +277,12 @@ def create_replica_should_succeed(find_replica, replica_name, replica_uuid):
 
 @then(parsers.parse('"{name}" should appear in the output list'))
 def replica_should_appear_in_output(name, list_replicas):
-    assert name in [replica.name for replica in list_replicas]
+    assert name in {replica.name for replica in list_replicas}
 
 
 @then(parsers.parse('"{name}" should appear in the output list based on replica name'))
 def replica_should_appear_in_output_list(name, list_replicas_by_name):
-    assert name in [replica.name for replica in list_replicas_by_name]
+    assert name in {replica.name for replica in list_replicas_by_name}
 
 
 @then(
@@ -390,7 +296,7 @@ def no_of_replicas_in_output_list(list_replicas_by_name, n):
 
 @then(parsers.parse('"{name}" should appear in the output list based on pool name'))
 def replica_should_appear_in_output_list(name, list_replicas_by_pool_name):
-    assert name in [replica.name for replica in list_replicas_by_pool_name]
+    assert name in {replica.name for replica in list_replicas_by_pool_name}
 
 
 @then(
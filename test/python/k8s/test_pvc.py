@@ -2,13 +2,28 @@ import pytest
 from kubernetes import client, config, dynamic, watch
 from kubernetes.client import api_client
 import asyncio
+from functools import lru_cache
 from kubernetes import utils
 
 
+# Connection pool size of the shared API client, the watches running in
+# threads each hold on to a connection.
+CONNECTION_POOL_SIZE = 32
+
+
+# All resource APIs share one client, reusing its connections to the apiserver.
+@lru_cache(maxsize=1)
+def get_dynamic_client():
+    config.load_kube_config()
+    configuration = client.Configuration.get_default_copy()
+    configuration.connection_pool_maxsize = CONNECTION_POOL_SIZE
+    return dynamic.DynamicClient(api_client.ApiClient(configuration=configuration))
+
+
+# Discovery is expensive, so each resource is only looked up once.
+@lru_cache(maxsize=None)
 def get_api(api_name):
-    client = dynamic.DynamicClient(
-        api_client.ApiClient(configuration=config.load_kube_config())
-    )
+    client = get_dynamic_client()
 
     _apis = {
         "msp": (
@@ -89,48 +104,77 @@ def delete_pvc(name):
     get_api("pvc").delete(name=name, namespace="default")
 
 
+def phase_reached(obj, phase):
+    try:
+        return obj["status"]["phase"] == phase or obj["status"]["state"] == phase
+    except:
+        return False
+
+
 # wait for a resource to reach a certain state
 async def wait_for_it(api, name, phase, namespace="default", iter=1000):
-    while iter > 0:
-        try:
-            current = api.get(name=name, namespace=namespace)
-            if current["status"]["phase"] == str(phase) or current["status"][
-                "state"
-            ] == str(phase):
-                return
-        except:
-            pass
-        iter -= 1
-        if iter == 0:
-            raise Exception(f"timed out {api} while creating {name}")
-        await asyncio.sleep(0.1)
+    # The watch starts out with the current object, so the state is seen as
+    # soon as it is reached and a transition before the watch can't be missed.
+    def watch_phase():
+        w = watch.Watch()
+        for event in api.watch(
+            name=name, namespace=namespace, timeout=iter // 10, watcher=w
+        ):
+            if phase_reached(event["object"], str(phase)):
+                w.stop()
+                return True
+        return False
+
+    if not await asyncio.to_thread(watch_phase):
+        raise Exception(f"timed out {api} while creating {name}")
 
 
 # wait until a resource no longer exists
 async def wait_until_gone(api, name, iter=1000):
-    while iter > 0:
+    def watch_deleted():
         try:
-            api.get(name=name, namespace="default")
+            current = api.get(name=name, namespace="default")
         except:
-            return
-        iter -= 1
-        if iter == 0:
-            raise Exception(f"timed out waiting for {name} to disappear")
-        await asyncio.sleep(0.1)
+            return True
+        # Watch from the version just read so the deletion can't be missed.
+        w = watch.Watch()
+        for event in api.watch(
+            name=name,
+            namespace="default",
+            resource_version=current.metadata.resourceVersion,
+            timeout=iter // 10,
+            watcher=w,
+        ):
+            if event["type"] == "DELETED":
+                w.stop()
+                return True
+        return False
+
+    if not await asyncio.to_thread(watch_deleted):
+        raise Exception(f"timed out waiting for {name} to disappear")
 
 
 # watch events to a certain pod
 async def watch_for(bail_on, pod):
-    w = watch.Watch()
-    for event in w.stream(client.CoreV1Api().list_pod_for_all_namespaces):
-        if event["type"] == bail_on and event["object"].metadata.name == pod:
-            print(
-                "Event: %s %s %s"
-                % (event["type"], event["object"].kind, event["object"].metadata.name)
-            )
-            assert event["object"].status.phase, "Succeeded"
-            return
-        await asyncio.sleep(0)
+    # Only the events of the pod itself are streamed, and the blocking watch
+    # runs in a thread so the event loop is free while waiting.
+    def watch_pod():
+        w = watch.Watch()
+        for event in w.stream(
+            client.CoreV1Api().list_namespaced_pod,
+            namespace="default",
+            field_selector=f"metadata.name={pod}",
+        ):
+            if event["type"] == bail_on:
+                w.stop()
+                return event
+
+    event = await asyncio.to_thread(watch_pod)
+    print(
+        "Event: %s %s %s"
+        % (event["type"], event["object"].kind, event["object"].metadata.name)
+    )
+    assert event["object"].status.phase, "Succeeded"
 
 
 async def fio_delete(name="fio"):
@@ -162,6 +206,20 @@ async def fio_from_yaml():
     await fio_delete()
 
 
+FIO_ARGS = (
+    "fio",
+    "--direct=1",
+    "--rw=randrw",
+    "--ioengine=libaio",
+    "--bs=4k",
+    "--iodepth=16",
+    "--verify=crc32",
+    "--verify_fatal=1",
+    "--verify_async=2",
+    "--time_based=1",
+)
+
+
 # Its rather tedious to create a "large" spec by constructing the
 # json object on the fly -- without using some form of templating.
 # As an alternative approach we use the V1XXX models generated by
@@ -191,11 +249,7 @@ async def create_fio_manifest(pvcs, size=1, runtime=30):
         fio_targets.append(f"--name={name}")
         fio_targets.append(f"--filename=/volume-{i}/{name}.test")
 
-    cmd = "fio --direct=1 --rw=randrw --ioengine=libaio"
-    cmd += " --bs=4k --iodepth=16 --verify=crc32 --verify_fatal=1 --verify_async=2"
-    cmd += f" --time_based=1 --runtime={runtime} --size={size}"
-
-    command = cmd.split() + fio_targets
+    command = [*FIO_ARGS, f"--runtime={runtime}", f"--size={size}", *fio_targets]
 
     container = client.V1Container(
         name="fio-generated",
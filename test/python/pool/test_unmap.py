@@ -1,10 +1,11 @@
 # validate that when recreating lvols on the same pool,
 # does not retain previous filesystem data
 
-from common.mayastor import mayastors, target_vm
+from common.mayastor import concurrently, mayastors, target_vm
+import asyncio
 import pytest
-from common.nvme import nvme_remote_connect, nvme_remote_disconnect
-from common.command import run_cmd_async_at
+from common.nvme import nvme_remote_connect_many, nvme_remote_disconnect
+from common.command import run_cmd_async_at, close_remote_connections
 import json
 
 
@@ -16,46 +17,49 @@ def create_pool(mayastors):
     ms.pool_destroy("tpool")
 
 
+# The replicas are independent of each other, so create and destroy them in
+# parallel.
 def create_volumes(mayastors):
     ms = mayastors.get("ms0")
-    for i in range(0, 15):
-        ms.replica_create("tpool", f"replica-{i}", 4 * 1024 * 1024)
+    concurrently(
+        lambda i: ms.replica_create("tpool", f"replica-{i}", 4 * 1024 * 1024),
+        range(0, 15),
+    )
 
 
 def delete_volumes(mayastors):
     ms = mayastors.get("ms0")
-    for i in range(0, 15):
-        ms.replica_destroy(f"replica-{i}")
+    concurrently(lambda i: ms.replica_destroy(f"replica-{i}"), range(0, 15))
 
 
 # this will fail the second time around as mkfs will fail if it finds
 # a preexisting filesystem
 async def mkfs_on_target(target_vm, mayastors):
     host_ip = mayastors.get("ms0").ip_address()
-    remote_devices = []
-    for i in range(0, 15):
-        dev = await nvme_remote_connect(
-            target_vm, f"nvmf://{host_ip}:8420/nqn.2019-05.io.openebs:replica-{i}"
-        )
-        remote_devices.append(dev)
+    uris = [
+        f"nvmf://{host_ip}:8420/nqn.2019-05.io.openebs:replica-{i}"
+        for i in range(0, 15)
+    ]
+    remote_devices = await nvme_remote_connect_many(target_vm, uris)
 
     print(await run_cmd_async_at(target_vm, "lsblk -o name,fstype -J"))
 
-    for d in remote_devices:
-        await run_cmd_async_at(target_vm, f"sudo mkfs.xfs {d}")
+    await asyncio.gather(
+        *(run_cmd_async_at(target_vm, f"sudo mkfs.xfs {d}") for d in remote_devices)
+    )
 
-    for i in range(0, 15):
-        dev = await nvme_remote_disconnect(
-            target_vm, f"nvmf://{host_ip}:8420/nqn.2019-05.io.openebs:replica-{i}"
-        )
+    await asyncio.gather(*(nvme_remote_disconnect(target_vm, uri) for uri in uris))
 
 
 @pytest.mark.asyncio
 async def test_lvol_unmap(mayastors, create_pool, target_vm):
-    create_volumes(mayastors)
-    await mkfs_on_target(target_vm, mayastors)
-    delete_volumes(mayastors)
+    try:
+        create_volumes(mayastors)
+        await mkfs_on_target(target_vm, mayastors)
+        delete_volumes(mayastors)
 
-    create_volumes(mayastors)
-    await mkfs_on_target(target_vm, mayastors)
-    delete_volumes(mayastors)
+        create_volumes(mayastors)
+        await mkfs_on_target(target_vm, mayastors)
+        delete_volumes(mayastors)
+    finally:
+        await close_remote_connections()
@@ -108,8 +108,12 @@ async def test_controller_stats(mayastor_mod, create_replicas, create_nexus):
             assert stats[n] == 0, "Stat %s is not zero for a new controller" % n
 
     # Issue I/O to replicas and make sure stats reflect that.
-    job = FioSpdk("job1", "readwrite", create_nexus, runtime=5).build()
-    await run_cmd_async(job)
+    fio = FioSpdk("job1", "readwrite", create_nexus, runtime=5)
+    result = await run_cmd_async(fio.build())
+    fio_stats = fio.results(result.stdout)
+    print(fio_stats)
+    assert fio_stats["read"]["iops"] > 0, "fio did not read"
+    assert fio_stats["write"]["iops"] > 0, "fio did not write"
 
     target_stats = ["num_read_ops", "num_write_ops", "bytes_read", "bytes_written"]
     cached_stats = {"num_write_ops": 0, "bytes_written": 0}
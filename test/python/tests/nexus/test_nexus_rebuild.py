@@ -92,7 +92,7 @@ def test_rebuild_failure(containers, mayastors, times, create_nexuses):
 
     # Add the replicas to the nexuses for rebuild.
     for (idx, nexus) in enumerate(ms0.nexus_list()):
-        child = list(filter(lambda child: child.state == pb.CHILD_FAULTED, list(nexus.children)))[0]
+        child = next(c for c in nexus.children if c.state == pb.CHILD_FAULTED)
         if nexus.state != pb.NEXUS_FAULTED:
             try:
                 ms0.nexus_remove_replica(nexus.uuid, child.uri)
@@ -4,7 +4,7 @@ from pytest_bdd import given, scenario, then, when, parsers
 
 from common.command import run_cmd
 from common.fio import Fio
-from common.mayastor import container_mod, mayastor_mod
+from common.mayastor import container_mod, mayastor_mod, concurrently
 
 import grpc
 import subprocess
@@ -93,7 +93,7 @@ def fio_client_is_running_against_target_nexus(get_connected_nexus):
     assert subsystem["Paths"][0]["State"] == "live", "I/O path is not healthy"
     # Launch fio in background and let it always run along with the test.
     fio = Fio("job2", "randwrite", dev, runtime=FIO_RUNTIME).build()
-    return subprocess.Popen(fio, shell=True)
+    return subprocess.Popen(fio)
 
 
 @when("nexus is shutdown")
@@ -184,17 +184,17 @@ def create_connected_nexus(mayastor_mod, create_published_nexus):
 def create_pools(mayastor_mod):
     hdls = mayastor_mod
 
-    pools = []
-    pools.append(hdls["ms1"].pool_create(POOL_NAME, POOL_DEV_URI))
-    pools.append(hdls["ms2"].pool_create(POOL_NAME, POOL_DEV_URI))
+    pools = concurrently(
+        lambda ms: hdls[ms].pool_create(POOL_NAME, POOL_DEV_URI), ["ms1", "ms2"]
+    )
+    pools = list(pools.values())
 
     for p in pools:
         assert p.state == pb.POOL_ONLINE
     yield pools
 
     try:
-        hdls["ms1"].pool_destroy(POOL_NAME)
-        hdls["ms2"].pool_destroy(POOL_NAME)
+        concurrently(lambda ms: hdls[ms].pool_destroy(POOL_NAME), ["ms1", "ms2"])
     except Exception:
         pass
 
@@ -203,18 +203,15 @@ def create_pools(mayastor_mod):
 def create_replica(mayastor_mod, create_pools):
     hdls = mayastor_mod
     pools = create_pools
-    replicas = []
 
-    replicas.append(
-        hdls["ms1"].replica_create(pools[0].name, REPLICA_UUID, REPLICA_SIZE)
-    )
-    replicas.append(
-        hdls["ms2"].replica_create(pools[0].name, REPLICA_UUID, REPLICA_SIZE)
+    replicas = concurrently(
+        lambda ms: hdls[ms].replica_create(pools[0].name, REPLICA_UUID, REPLICA_SIZE),
+        ["ms1", "ms2"],
     )
+    replicas = list(replicas.values())
 
     yield replicas
     try:
-        hdls["ms1"].replica_destroy(REPLICA_UUID)
-        hdls["ms2"].replica_destroy(REPLICA_UUID)
+        concurrently(lambda ms: hdls[ms].replica_destroy(REPLICA_UUID), ["ms1", "ms2"])
     except Exception as e:
         logging.debug(e)
@@ -58,7 +58,7 @@ def _(mounted_nexus):
         f"job-raw", "randwrite", f"{mounted_nexus}/fio.io", size="200M"
     ).build()
     print(fio_cmd)
-    yield subprocess.Popen(fio_cmd, shell=True)
+    yield subprocess.Popen(fio_cmd)
 
 
 @given("a local mayastor instance")
@@ -4,7 +4,7 @@ from pytest_bdd import given, scenario, then, when, parsers
 
 from common.command import run_cmd
 from common.fio import Fio
-from common.mayastor import container_mod, mayastor_mod
+from common.mayastor import container_mod, mayastor_mod, concurrently
 
 import grpc
 import subprocess
@@ -182,18 +182,16 @@ def create_pools(mayastor_mod, pool_config):
     hdls = mayastor_mod
 
     cfg = pool_config
-    pools = []
-
-    pools.append(hdls["ms1"].pool_create(cfg.get("name"), cfg.get("uri")))
-
-    pools.append(hdls["ms2"].pool_create(cfg.get("name"), cfg.get("uri")))
+    pools = concurrently(
+        lambda ms: hdls[ms].pool_create(cfg.get("name"), cfg.get("uri")), ["ms1", "ms2"]
+    )
+    pools = list(pools.values())
 
     for p in pools:
         assert p.state == pb.POOL_ONLINE
     yield pools
     try:
-        hdls["ms1"].pool_destroy(cfg.get("name"))
-        hdls["ms2"].pool_destroy(cfg.get("name"))
+        concurrently(lambda ms: hdls[ms].pool_destroy(cfg.get("name")), ["ms1", "ms2"])
     except Exception:
         pass
 
@@ -202,17 +200,17 @@ def create_pools(mayastor_mod, pool_config):
 def create_replica(mayastor_mod, replica_uuid, create_pools):
     hdls = mayastor_mod
     pools = create_pools
-    replicas = []
 
     UUID, size_mb = replica_uuid
 
-    replicas.append(hdls["ms1"].replica_create(pools[0].name, UUID, size_mb))
-    replicas.append(hdls["ms2"].replica_create(pools[0].name, UUID, size_mb))
+    replicas = concurrently(
+        lambda ms: hdls[ms].replica_create(pools[0].name, UUID, size_mb), ["ms1", "ms2"]
+    )
+    replicas = list(replicas.values())
 
     yield replicas
     try:
-        hdls["ms1"].replica_destroy(UUID)
-        hdls["ms2"].replica_destroy(UUID)
+        concurrently(lambda ms: hdls[ms].replica_destroy(UUID), ["ms1", "ms2"])
     except Exception as e:
         logging.debug(e)
 
@@ -363,7 +361,7 @@ def run_fio_against_single_path_nexus(a_client_connected_to_one_path_nexus):
     assert subsystem["Paths"][0]["State"] == "live", "I/O path is not healthy"
     # Launch fio in background and let it always run along with the test.
     fio = Fio("job2", "randwrite", dev, runtime=FIO_RUNTIME).build()
-    return subprocess.Popen(fio, shell=True)
+    return subprocess.Popen(fio)
 
 
 @when("the only I/O path degrades")
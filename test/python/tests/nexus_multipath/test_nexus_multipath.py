@@ -1,5 +1,5 @@
 from common.volume import Volume
-from common.mayastor import container_mod, mayastor_mod
+from common.mayastor import container_mod, mayastor_mod, concurrently
 from common.hdl import MayastorHandle
 import logging
 import pytest
@@ -276,18 +276,16 @@ def create_pools(mayastor_mod, pool_config):
     hdls = mayastor_mod
 
     cfg = pool_config
-    pools = []
-
-    pools.append(hdls["ms1"].pool_create(cfg.get("name"), cfg.get("uri")))
-
-    pools.append(hdls["ms2"].pool_create(cfg.get("name"), cfg.get("uri")))
+    pools = concurrently(
+        lambda ms: hdls[ms].pool_create(cfg.get("name"), cfg.get("uri")), ["ms1", "ms2"]
+    )
+    pools = list(pools.values())
 
     for p in pools:
         assert p.state == pb.POOL_ONLINE
     yield pools
     try:
-        hdls["ms1"].pool_destroy(cfg.get("name"))
-        hdls["ms2"].pool_destroy(cfg.get("name"))
+        concurrently(lambda ms: hdls[ms].pool_destroy(cfg.get("name")), ["ms1", "ms2"])
     except Exception:
         pass
 
@@ -296,17 +294,17 @@ def create_pools(mayastor_mod, pool_config):
 def create_replica(mayastor_mod, replica_uuid, create_pools):
     hdls = mayastor_mod
     pools = create_pools
-    replicas = []
 
     UUID, size_mb = replica_uuid
 
-    replicas.append(hdls["ms1"].replica_create(pools[0].name, UUID, size_mb))
-    replicas.append(hdls["ms2"].replica_create(pools[0].name, UUID, size_mb))
+    replicas = concurrently(
+        lambda ms: hdls[ms].replica_create(pools[0].name, UUID, size_mb), ["ms1", "ms2"]
+    )
+    replicas = list(replicas.values())
 
     yield replicas
     try:
-        hdls["ms1"].replica_destroy(UUID)
-        hdls["ms2"].replica_destroy(UUID)
+        concurrently(lambda ms: hdls[ms].replica_destroy(UUID), ["ms1", "ms2"])
     except Exception as e:
         logging.debug(e)
 
@@ -314,11 +312,11 @@ def create_replica(mayastor_mod, replica_uuid, create_pools):
 @pytest.fixture
 def start_fio(create_nexus_dev):
     dev = create_nexus_dev
-    cmd = Fio("job1", "randwrite", dev).build().split()
+    cmd = Fio("job1", "randwrite", dev).build()
     output = subprocess.Popen(cmd)
     # wait for fio to start
     time.sleep(1)
-    yield
+    yield output
     output.communicate()
     assert output.returncode == 0
 
@@ -402,7 +400,6 @@ def test_nexus_multipath_add_3rd_path(
 
     dev = create_nexus_dev
     dev2 = create_nexus_2_dev
-    start_fio
     dev3 = create_nexus_3_dev
     assert dev == dev2, "should have one namespace"
     assert dev == dev3, "should have one namespace"
@@ -412,7 +409,7 @@ def test_nexus_multipath_add_3rd_path(
     assert len(paths) == 3, "should have 3 paths"
 
     # wait for fio to complete
-    time.sleep(15)
+    start_fio.wait()
 
 
 @pytest.mark.timeout(60)
@@ -442,7 +439,7 @@ def test_nexus_multipath_remove_3rd_path(
     assert paths[2]["State"] == "live"
 
     # wait for fio to complete
-    time.sleep(15)
+    start_fio.wait()
 
 
 @pytest.mark.timeout(60)
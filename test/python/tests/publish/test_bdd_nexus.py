@@ -1,10 +1,10 @@
 import pytest
-from pytest_bdd import given, scenario, then, when, parsers
+from pytest_bdd import given, scenarios, then, when, parsers
 
 from collections import namedtuple
-import subprocess
 
-from common.mayastor import container_mod, mayastor_mod
+from common.command import create_local_files, remove_local_files
+from common.mayastor import concurrently, container_mod, mayastor_mod
 from common.volume import Volume
 
 import grpc
@@ -23,110 +23,18 @@ def get_child_uris(nexus):
     return [child.uri for child in nexus.children]
 
 
-def share_type(protocol):
-    TYPES = {
-        "nbd": pb.ShareProtocolNexus.NEXUS_NBD,
-        "nvmf": pb.ShareProtocolNexus.NEXUS_NVMF,
-        "iscsi": pb.ShareProtocolNexus.NEXUS_ISCSI,
-    }
-    return TYPES[protocol]
-
-
-@scenario("features/nexus.feature", "creating a nexus")
-def test_creating_a_nexus():
-    "Creating a nexus."
-
-
-@scenario("features/nexus.feature", "creating the same nexus")
-def test_creating_the_same_nexus():
-    "Creating the same nexus."
-
-
-@scenario("features/nexus.feature", "creating a different nexus with the same children")
-def test_fail_creating_a_different_nexus_with_the_same_children():
-    "Creating a different nexus with the same children."
-
-
-@scenario("features/nexus.feature", "creating a nexus without children")
-def test_fail_creating_a_nexus_without_children():
-    "Creating a nexus without children."
-
-
-@scenario("features/nexus.feature", "creating a nexus with missing children")
-def test_fail_creating_a_nexus_with_missing_children():
-    "Creating a nexus with missing children."
-
-
-@scenario(
-    "features/nexus.feature", "creating a nexus from children with mixed block sizes"
-)
-def test_fail_creating_a_nexus_from_children_with_mixed_block_sizes():
-    "Creating a nexus from children with mixed block sizes."
-
-
-@scenario("features/nexus.feature", "creating a nexus that is larger than its children")
-def test_fail_creating_a_nexus_larger_than_its_children():
-    "Creating a nexus that is larger than its children."
-
-
-@scenario("features/nexus.feature", "destroying a nexus")
-def test_destroying_a_nexus():
-    "Destroying a nexus."
-
-
-@scenario("features/nexus.feature", "destroying a nexus without first unpublishing")
-def test_destroying_a_nexus_without_first_unpublishing():
-    "Destroying a nexus without first unpublishing."
-
-
-@scenario("features/nexus.feature", "destroying a nexus that does not exist")
-def test_destroying_a_nexus_that_does_not_exist():
-    "Destroying a nexus that does not exist."
-
+SHARE_TYPES = {
+    "nbd": pb.ShareProtocolNexus.NEXUS_NBD,
+    "nvmf": pb.ShareProtocolNexus.NEXUS_NVMF,
+    "iscsi": pb.ShareProtocolNexus.NEXUS_ISCSI,
+}
 
-@scenario("features/nexus.feature", "listing nexuses")
-def test_listing_nexuses():
-    "Listing nexuses."
 
-
-@scenario("features/nexus.feature", "removing a child from a nexus")
-def test_removing_a_child_from_a_nexus():
-    "Removing a child from a nexus."
-
-
-@scenario("features/nexus.feature", "adding a child to a nexus")
-def test_adding_a_child_to_a_nexus():
-    "Adding a child to a nexus."
-
-
-@scenario("features/nexus.feature", "publishing a nexus")
-def test_publishing_a_nexus():
-    "Publishing a nexus."
-
-
-@scenario("features/nexus.feature", "unpublishing a nexus")
-def test_unpublishing_a_nexus():
-    "Unpublishing a nexus."
-
-
-@scenario("features/nexus.feature", "unpublishing a nexus that is not published")
-def test_unpublishing_a_nexus_that_is_not_published():
-    "Unpublishing a nexus that is not published."
-
-
-@scenario("features/nexus.feature", "republishing a nexus with a different protocol")
-def test_fail_republishing_a_nexus_with_a_different_protocol():
-    "Republishing a nexus with a different protocol."
-
-
-@scenario("features/nexus.feature", "republishing a nexus with the same protocol")
-def test_republishing_a_nexus_with_the_same_protocol():
-    "Republishing a nexus with the same protocol."
+def share_type(protocol):
+    return SHARE_TYPES[protocol]
 
 
-@scenario("features/nexus.feature", "publishing a nexus with a crypto-key")
-def test_publishing_a_nexus_with_a_cryptokey():
-    "Publishing a nexus with a crypto-key."
+scenarios("features/nexus.feature")
 
 
 @pytest.fixture(scope="module")
@@ -156,14 +64,18 @@ def local_bdev_uri():
 
 @pytest.fixture(scope="module")
 def base_bdevs(mayastor_mod, base_instances):
-    devices = {}
-    for instance in base_instances:
-        uri = "malloc:///malloc0?size_mb=64&blk_size=4096"
-        name = mayastor_mod[instance].bdev.Create(pb.BdevUri(uri=uri)).name
-        devices[instance] = BaseBdev(name, uri)
+    uri = "malloc:///malloc0?size_mb=64&blk_size=4096"
+    # Each instance gets its own bdev, so they are created in parallel.
+    names = concurrently(
+        lambda instance: mayastor_mod[instance].bdev.Create(pb.BdevUri(uri=uri)).name,
+        base_instances,
+    )
+    devices = {instance: BaseBdev(name, uri) for instance, name in names.items()}
     yield devices
-    for instance, bdev in devices.items():
-        mayastor_mod[instance].bdev.Destroy(pb.BdevUri(uri=bdev.uri))
+    concurrently(
+        lambda instance: mayastor_mod[instance].bdev.Destroy(pb.BdevUri(uri=uri)),
+        devices,
+    )
 
 
 @pytest.fixture(scope="module")
@@ -188,15 +100,11 @@ def local_files(file_types):
     files = {}
     for type in file_types:
         path = f"/tmp/{type}-file.img"
-        uri = f"{type}://{path}?blk_size=4096"
-        subprocess.run(
-            ["sudo", "sh", "-c", f"rm -f '{path}' && truncate -s 64M '{path}'"],
-            check=True,
-        )
-        files[type] = LocalFile(path, uri)
+        files[type] = LocalFile(path, f"{type}://{path}?blk_size=4096")
+    paths = [file.path for file in files.values()]
+    create_local_files(paths, megabytes(64))
     yield files
-    for path in [file.path for file in files.values()]:
-        subprocess.run(["sudo", "sh", "-c", f"rm -f '{path}'"], check=True)
+    remove_local_files(paths)
 
 
 @pytest.fixture(scope="module")
@@ -218,7 +126,7 @@ def local_bdev_with_512_blocksize(mayastor_mod, nexus_instance):
     mayastor_mod[nexus_instance].bdev.Destroy(pb.BdevUri(uri=uri))
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def nexus_children(local_bdev_uri, shared_remote_bdev_uri, local_files):
     return [local_bdev_uri, shared_remote_bdev_uri] + [
         file.uri for file in local_files.values()
@@ -374,9 +282,8 @@ def publish_nexus(mayastor_mod, nexus_instance, nexus_uuid, protocol):
 
 @when("publishing the nexus with the same protocol")
 def publishing_the_nexus_with_the_same_protocol(
-    find_nexus, mayastor_mod, nexus_instance, nexus_uuid
+    mayastor_mod, nexus_instance, nexus_uuid
 ):
-    nexus = find_nexus(nexus_uuid)
     mayastor_mod[nexus_instance].ms.PublishNexus(
         pb.PublishNexusRequest(
             uuid=nexus_uuid, key="", share=pb.ShareProtocolNexus.NEXUS_NVMF
@@ -386,9 +293,8 @@ def publishing_the_nexus_with_the_same_protocol(
 
 @when("attempting to publish the nexus with a different protocol")
 def attempt_to_publish_nexus_with_different_protocol(
-    find_nexus, mayastor_mod, nexus_instance, nexus_uuid
+    mayastor_mod, nexus_instance, nexus_uuid
 ):
-    nexus = find_nexus(nexus_uuid)
     with pytest.raises(grpc.RpcError) as error:
         mayastor_mod[nexus_instance].ms.PublishNexus(
             pb.PublishNexusRequest(
@@ -445,12 +351,15 @@ def the_child_should_be_successfully_added(find_nexus, nexus_uuid, nexus_childre
 
 @then("the nexus should appear in the output list")
 def nexus_should_appear_in_output(nexus_uuid, list_nexuses):
-    assert nexus_uuid in [nexus.uuid for nexus in list_nexuses]
+    assert nexus_uuid in {nexus.uuid for nexus in list_nexuses}
 
 
 @then("the nexus should be created")
-def nexus_should_be_created(find_nexus, nexus_uuid, nexus_children):
-    nexus = find_nexus(nexus_uuid)
+def nexus_should_be_created(created_nexuses, find_nexus, nexus_uuid, nexus_children):
+    # CreateNexus replies with the new nexus, only list them if it wasn't ours.
+    nexus = created_nexuses.get(nexus_uuid)
+    if nexus is None:
+        nexus = find_nexus(nexus_uuid)
     assert nexus != None
     assert sorted(get_child_uris(nexus)) == sorted(nexus_children)
     assert nexus.state == pb.NexusState.NEXUS_ONLINE
@@ -1,9 +1,9 @@
 import pytest
 
 from collections import namedtuple
-import subprocess
 
-from common.mayastor import container_mod, mayastor_mod
+from common.command import create_local_files, remove_local_files
+from common.mayastor import concurrently, container_mod, mayastor_mod
 
 import grpc
 import mayastor_pb2 as pb
@@ -25,13 +25,15 @@ def get_child_uris(nexus):
     return [child.uri for child in nexus.children]
 
 
+SHARE_TYPES = {
+    "nbd": pb.ShareProtocolNexus.NEXUS_NBD,
+    "nvmf": pb.ShareProtocolNexus.NEXUS_NVMF,
+    "iscsi": pb.ShareProtocolNexus.NEXUS_ISCSI,
+}
+
+
 def share_type(protocol):
-    TYPES = {
-        "nbd": pb.ShareProtocolNexus.NEXUS_NBD,
-        "nvmf": pb.ShareProtocolNexus.NEXUS_NVMF,
-        "iscsi": pb.ShareProtocolNexus.NEXUS_ISCSI,
-    }
-    return TYPES[protocol]
+    return SHARE_TYPES[protocol]
 
 
 @pytest.fixture(scope="module")
@@ -56,14 +58,18 @@ def local_bdev_uri():
 
 @pytest.fixture(scope="module")
 def base_bdevs(mayastor_mod, base_instances):
-    devices = {}
-    for instance in base_instances:
-        uri = "malloc:///malloc0?size_mb=64&blk_size=4096"
-        name = mayastor_mod[instance].bdev.Create(pb.BdevUri(uri=uri)).name
-        devices[instance] = BaseBdev(name, uri)
+    uri = "malloc:///malloc0?size_mb=64&blk_size=4096"
+    # Each instance gets its own bdev, so they are created in parallel.
+    names = concurrently(
+        lambda instance: mayastor_mod[instance].bdev.Create(pb.BdevUri(uri=uri)).name,
+        base_instances,
+    )
+    devices = {instance: BaseBdev(name, uri) for instance, name in names.items()}
     yield devices
-    for instance, bdev in devices.items():
-        mayastor_mod[instance].bdev.Destroy(pb.BdevUri(uri=bdev.uri))
+    concurrently(
+        lambda instance: mayastor_mod[instance].bdev.Destroy(pb.BdevUri(uri=uri)),
+        devices,
+    )
 
 
 @pytest.fixture(scope="module")
@@ -88,15 +94,11 @@ def local_files(file_types):
     files = {}
     for type in file_types:
         path = f"/tmp/{type}-file.img"
-        uri = f"{type}://{path}?blk_size=4096"
-        subprocess.run(
-            ["sudo", "sh", "-c", f"rm -f '{path}' && truncate -s 64M '{path}'"],
-            check=True,
-        )
-        files[type] = LocalFile(path, uri)
+        files[type] = LocalFile(path, f"{type}://{path}?blk_size=4096")
+    paths = [file.path for file in files.values()]
+    create_local_files(paths, megabytes(64))
     yield files
-    for path in [file.path for file in files.values()]:
-        subprocess.run(["sudo", "sh", "-c", f"rm -f '{path}'"], check=True)
+    remove_local_files(paths)
 
 
 @pytest.fixture(scope="module")
@@ -1,11 +1,11 @@
 import pytest
-from pytest_bdd import given, scenario, then, when, parsers
+from pytest_bdd import given, scenarios, then, when, parsers
 from retrying import retry
 
 import os
-import subprocess
-import time
 
+from common.command import create_local_files, remove_local_files
+from common.rebuild import cancel_rebuild, wait_rebuild_state
 from common.mayastor import container_mod, mayastor_mod
 from common.volume import Volume
 
@@ -24,32 +24,38 @@ def find_child(nexus, uri):
     return None
 
 
+NEXUS_STATES = {
+    "UNKNOWN": pb.NexusState.NEXUS_UNKNOWN,
+    "ONLINE": pb.NexusState.NEXUS_ONLINE,
+    "DEGRADED": pb.NexusState.NEXUS_DEGRADED,
+    "FAULTED": pb.NexusState.NEXUS_FAULTED,
+}
+
+
 def convert_nexus_state(state):
-    STATES = {
-        "UNKNOWN": pb.NexusState.NEXUS_UNKNOWN,
-        "ONLINE": pb.NexusState.NEXUS_ONLINE,
-        "DEGRADED": pb.NexusState.NEXUS_DEGRADED,
-        "FAULTED": pb.NexusState.NEXUS_FAULTED,
-    }
-    return STATES[state]
+    return NEXUS_STATES[state]
+
+
+CHILD_STATES = {
+    "UNKNOWN": pb.ChildState.CHILD_UNKNOWN,
+    "ONLINE": pb.ChildState.CHILD_ONLINE,
+    "DEGRADED": pb.ChildState.CHILD_DEGRADED,
+    "FAULTED": pb.ChildState.CHILD_FAULTED,
+}
 
 
 def convert_child_state(state):
-    STATES = {
-        "UNKNOWN": pb.ChildState.CHILD_UNKNOWN,
-        "ONLINE": pb.ChildState.CHILD_ONLINE,
-        "DEGRADED": pb.ChildState.CHILD_DEGRADED,
-        "FAULTED": pb.ChildState.CHILD_FAULTED,
-    }
-    return STATES[state]
+    return CHILD_STATES[state]
+
+
+CHILD_ACTIONS = {
+    "OFFLINE": pb.ChildAction.offline,
+    "ONLINE": pb.ChildAction.online,
+}
 
 
 def convert_child_action(state):
-    ACTIONS = {
-        "OFFLINE": pb.ChildAction.offline,
-        "ONLINE": pb.ChildAction.online,
-    }
-    return ACTIONS[state]
+    return CHILD_ACTIONS[state]
 
 
 def lookup_nexus(mayastor_instance, nexus_uuid):
@@ -63,59 +69,24 @@ def lookup_nexus_child(mayastor_instance, nexus_uuid, child_uri):
     nexus = lookup_nexus(mayastor_instance, nexus_uuid)
     if nexus is None:
         return None
-    for child in nexus.children:
-        if child.uri == child_uri:
-            return child
-    return None
+    return find_child(nexus, child_uri)
 
 
-@retry(wait_fixed=100, stop_max_attempt_number=5)
+@retry(wait_exponential_multiplier=10, wait_exponential_max=100, stop_max_delay=500)
 def wait_child_state(mayastor_instance, nexus_uuid, child_uri, state):
     child = lookup_nexus_child(mayastor_instance, nexus_uuid, child_uri)
     assert child is not None and child.state == convert_child_state(state)
 
 
-@scenario("features/rebuild.feature", "running rebuild")
-def test_running_rebuild():
-    "Running rebuild."
-
-
-@scenario("features/rebuild.feature", "stopping rebuild")
-def test_stopping_rebuild():
-    "Stopping rebuild."
-
-
-@scenario("features/rebuild.feature", "pausing rebuild")
-def test_pausing_rebuild():
-    "Pausing rebuild."
-
-
-@scenario("features/rebuild.feature", "resuming rebuild")
-def test_resuming_rebuild():
-    "Resuming rebuild."
-
-
-@scenario("features/rebuild.feature", "setting a child ONLINE")
-def test_setting_a_child_online():
-    "Setting a child ONLINE."
-
-
-@scenario("features/rebuild.feature", "setting a child OFFLINE")
-def test_setting_a_child_offline():
-    "Setting a child OFFLINE."
+scenarios("features/rebuild.feature")
 
 
 @pytest.fixture(scope="module")
 def local_files():
     files = [f"/tmp/disk-rebuild-{base}.img" for base in ["source", "target"]]
-    for path in files:
-        subprocess.run(
-            ["sudo", "sh", "-c", f"rm -f '{path}' && truncate -s 64M '{path}'"],
-            check=True,
-        )
+    create_local_files(files, megabytes(64))
     yield
-    for path in files:
-        subprocess.run(["sudo", "rm", "-f", path], check=True)
+    remove_local_files(files)
 
 
 @pytest.fixture(scope="module")
@@ -146,7 +117,7 @@ def find_nexus(mayastor_instance):
     yield find
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mayastor_nexus(mayastor_instance, nexus_uuid, source_uri):
     nexus = mayastor_instance.ms.CreateNexus(
         pb.CreateNexusRequest(
@@ -157,6 +128,21 @@ def mayastor_nexus(mayastor_instance, nexus_uuid, source_uri):
     mayastor_instance.ms.DestroyNexus(pb.DestroyNexusRequest(uuid=nexus_uuid))
 
 
+@pytest.fixture(autouse=True)
+def reset_nexus_children(mayastor_instance, mayastor_nexus, nexus_uuid, target_uri):
+    "Remove the target child after each scenario, leaving the nexus with its source."
+    yield
+    cancel_rebuild(mayastor_instance, nexus_uuid, target_uri)
+    try:
+        mayastor_instance.ms.RemoveChildNexus(
+            pb.RemoveChildNexusRequest(uuid=nexus_uuid, uri=target_uri)
+        )
+    except grpc.RpcError as error:
+        # The scenario did not get to add the target child.
+        if error.code() != grpc.StatusCode.NOT_FOUND:
+            raise
+
+
 @pytest.fixture
 def nexus_state(mayastor_nexus, find_nexus, nexus_uuid):
     yield find_nexus(nexus_uuid)
@@ -203,7 +189,7 @@ def pause_rebuild(mayastor_instance, mayastor_nexus, nexus_uuid, target_uri):
     mayastor_instance.ms.PauseRebuild(
         pb.PauseRebuildRequest(uuid=nexus_uuid, uri=target_uri)
     )
-    time.sleep(0.5)
+    wait_rebuild_state(mayastor_instance, nexus_uuid, target_uri, "paused")
 
 
 @when("the rebuild operation is then resumed")
@@ -218,7 +204,7 @@ def stop_rebuild(mayastor_instance, mayastor_nexus, nexus_uuid, target_uri):
     mayastor_instance.ms.StopRebuild(
         pb.StopRebuildRequest(uuid=nexus_uuid, uri=target_uri)
     )
-    time.sleep(0.5)
+    wait_rebuild_state(mayastor_instance, nexus_uuid, target_uri, None)
 
 
 @when("the rebuild statistics are requested", target_fixture="rebuild_statistics")
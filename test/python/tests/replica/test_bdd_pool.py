@@ -1,6 +1,7 @@
 import pytest
-from pytest_bdd import given, scenario, then, when, parsers
+from pytest_bdd import given, scenarios, then, when, parsers
 
+from common.channel import rpc_future
 from common.command import run_cmd
 from common.mayastor import container_mod, mayastor_mod
 
@@ -8,39 +9,7 @@ import grpc
 import mayastor_pb2 as pb
 
 
-@scenario("features/pool.feature", "creating a pool using disk with invalid block size")
-def test_fail_creating_a_pool_using_disk_with_invalid_block_size():
-    "Creating a pool using disk with invalid block size."
-
-
-@scenario("features/pool.feature", "creating a pool with a name that already exists")
-def test_creating_a_pool_with_a_name_that_already_exists():
-    "Creating a pool with a name that already exists."
-
-
-@scenario("features/pool.feature", "creating a pool with an AIO disk")
-def test_creating_a_pool_with_an_aio_disk():
-    "Creating a pool with an AIO disk."
-
-
-@scenario("features/pool.feature", "creating a pool with multiple disks")
-def test_fail_creating_a_pool_with_multiple_disks():
-    "Creating a pool with multiple disks."
-
-
-@scenario("features/pool.feature", "destroying a pool")
-def test_destroying_a_pool():
-    "Destroying a pool."
-
-
-@scenario("features/pool.feature", "destroying a pool that does not exist")
-def test_destroying_a_pool_that_does_not_exist():
-    "Destroying a pool that does not exist."
-
-
-@scenario("features/pool.feature", "listing pools")
-def test_listing_pools():
-    "Listing pools."
+scenarios("features/pool.feature")
 
 
 @pytest.fixture
@@ -67,8 +36,13 @@ def find_pool(get_mayastor_instance):
 def replica_pools(get_mayastor_instance):
     pools = {}
     yield pools
-    for name in pools.keys():
-        get_mayastor_instance.ms.DestroyPool(pb.DestroyPoolRequest(name=name))
+    # Destroy the pools concurrently, waiting for all of them at the end.
+    futures = [
+        rpc_future(get_mayastor_instance.ms.DestroyPool, pb.DestroyPoolRequest(name=n))
+        for n in pools.keys()
+    ]
+    for future in futures:
+        future.result()
 
 
 @pytest.fixture
@@ -164,4 +138,4 @@ def pool_destruction_should_succeed(find_pool):
 
 @then("the pool should appear in the output list")
 def pool_should_appear_in_output(get_pool_name, list_pools):
-    assert get_pool_name in [pool.name for pool in list_pools]
+    assert get_pool_name in {pool.name for pool in list_pools}
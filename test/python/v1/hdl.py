@@ -16,11 +16,17 @@ import snapshot_pb2_grpc as snapshot_rpc
 import host_pb2_grpc as host_rpc
 from pytest_testconfig import config
 from functools import partial
+from common.channel import ready_channel, renew_channel, rpc_methods
 
 from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 
 pytest_plugins = ["docker_compose"]
 
+# Requests without arguments are never modified, so they can be shared.
+LIST_POOL_OPTIONS = pool_pb.ListPoolOptions()
+LIST_REPLICA_OPTIONS = replica_pb.ListReplicaOptions()
+LIST_NEXUS_OPTIONS = nexus_pb.ListNexusOptions()
+
 
 class MayastorHandle(object):
     """Mayastor gRPC handle."""
@@ -29,7 +35,7 @@ class MayastorHandle(object):
         """Init."""
         self.ip_v4 = ip_v4
         self.timeout = float(config["grpc"]["client_timeout"])
-        self.channel = grpc.insecure_channel(("%s:10124") % self.ip_v4)
+        self.channel = ready_channel("%s:10124" % self.ip_v4)
         self.bdev_rpc = bdev_rpc.BdevRpcStub(self.channel)
         self.pool_rpc = pool_rpc.PoolRpcStub(self.channel)
         self.replica_rpc = replica_rpc.ReplicaRpcStub(self.channel)
@@ -43,32 +49,31 @@ class MayastorHandle(object):
 
     def install_stub(self, name):
         switcher = {
-            "BdevRpcStub": getattr(bdev_rpc, "BdevRpcStub")(self.channel),
-            "HostRpcStub": getattr(host_rpc, "HostRpcStub")(self.channel),
-            "PoolRpcStub": getattr(pool_rpc, "PoolRpcStub")(self.channel),
-            "ReplicaRpcStub": getattr(replica_rpc, "ReplicaRpcStub")(self.channel),
-            "SnapshotRpcStub": getattr(snapshot_rpc, "SnapshotRpcStub")(self.channel),
-            "NexusRpcStub": getattr(nexus_rpc, "NexusRpcStub")(self.channel),
+            "BdevRpcStub": bdev_rpc,
+            "HostRpcStub": host_rpc,
+            "PoolRpcStub": pool_rpc,
+            "ReplicaRpcStub": replica_rpc,
+            "SnapshotRpcStub": snapshot_rpc,
+            "NexusRpcStub": nexus_rpc,
         }
-        stub = switcher[name]
+        stub = getattr(switcher[name], name)(self.channel)
 
         # Install default timeout to all functions, ignore system attributes.
-        for f in dir(stub):
-            if not f.startswith("__"):
-                h = getattr(stub, f)
-                setattr(stub, f, partial(h, timeout=self.timeout))
+        for f in rpc_methods(stub):
+            h = getattr(stub, f)
+            setattr(stub, f, partial(h, timeout=self.timeout))
         return stub
 
     def _readiness_check(self):
         try:
-            self.pool_list(pool_pb.ListPoolOptions())
+            self.pool_list(LIST_POOL_OPTIONS)
         except grpc._channel._InactiveRpcError:
             # This is to get around a gRPC bug.
             # Retry once before failing
-            self.pool_list(pool_pb.ListPoolOptions())
+            self.pool_list(LIST_POOL_OPTIONS)
 
     def reconnect(self):
-        self.channel = grpc.insecure_channel(("%s:10124") % self.ip_v4)
+        self.channel = renew_channel("%s:10124" % self.ip_v4)
         self.bdev_rpc = self.install_stub("BdevRpcStub")
         self.pool_rpc = self.install_stub("PoolRpcStub")
         self.replica_rpc = self.install_stub("ReplicaRpcStub")
@@ -77,11 +82,9 @@ class MayastorHandle(object):
         self.nexus_rpc = self.install_stub("NexusRpcStub")
         self._readiness_check()
 
-    def __del__(self):
-        del self.channel
-
     def close(self):
-        self.__del__()
+        """Drop this handle's reference, the channel itself is shared."""
+        self.channel = None
 
     def ip_address(self):
         return self.ip_v4
@@ -140,7 +143,7 @@ class MayastorHandle(object):
     def pool_list(self, opts=None):
         """Only list pools"""
         if opts == None:
-            opts = pool_pb.ListPoolOptions()
+            opts = LIST_POOL_OPTIONS
         return self.pool_rpc.ListPools(opts, wait_for_ready=True)
 
     def replica_create(self, pooluuid, name, uuid, size, share=1):
@@ -166,7 +169,7 @@ class MayastorHandle(object):
     def replica_list(self, opts):
         """List existing replicas along with their UUIDs"""
         if opts == None:
-            opts = replica_pb.ListReplicaOptions()
+            opts = LIST_REPLICA_OPTIONS
         return self.replica_rpc.ListReplicas(opts, wait_for_ready=True)
 
     def stat_nvme_controllers(self, name):
@@ -240,7 +243,7 @@ class MayastorHandle(object):
     def nexus_list(self, opts):
         """List all the nexus devices."""
         if opts == None:
-            opts = nexus_pb.ListNexusOptions()
+            opts = LIST_NEXUS_OPTIONS
         return self.nexus_rpc.ListNexus(opts).nexus_list
 
     def nexus_add_replica(self, uuid, uri, norebuild):
@@ -255,10 +258,25 @@ class MayastorHandle(object):
             nexus_pb.RemoveChildNexusRequest(uuid=uuid, uri=uri)
         )
 
+    def rebuild_state(self, uuid, uri):
+        """Get the state of the rebuild to the child, None if there is no job."""
+        try:
+            return self.nexus_rpc.GetRebuildState(
+                nexus_pb.RebuildStateRequest(nexus_uuid=uuid, uri=uri)
+            ).state
+        except grpc.RpcError:
+            return None
+
+    def rebuild_stop(self, uuid, uri):
+        """Stop the rebuild to the child."""
+        return self.nexus_rpc.StopRebuild(
+            nexus_pb.StopRebuildRequest(nexus_uuid=uuid, uri=uri)
+        )
+
     def pools_as_uris(self):
         """Return a list of pools as found on the system."""
         uris = []
-        pools = self.pool_rpc.ListPools(pool_pb.ListPoolOptions(), wait_for_ready=True)
+        pools = self.pool_rpc.ListPools(LIST_POOL_OPTIONS, wait_for_ready=True)
         for p in pools.pools:
             uri = "pool://{0}/{1}".format(self.ip_v4, p.name)
             uris.append(uri)
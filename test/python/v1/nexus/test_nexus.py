@@ -2,7 +2,7 @@ from v1.hdl import MayastorHandle
 from common.command import run_cmd, run_cmd_async
 from common.fio import Fio
 from common.fio_spdk import FioSpdk
-from v1.mayastor import containers, mayastors
+from v1.mayastor import containers, mayastors, concurrently
 from v1.volume import Volume
 import logging
 import pytest
@@ -163,22 +163,20 @@ def create_pools(containers, mayastors, pool_config):
     hdls = mayastors
 
     cfg = pool_config
-    pools = []
-
-    pools.append(
-        hdls["ms1"].pool_create(cfg.get("name"), cfg.get("uuid"), [cfg.get("uri")])
-    )
-    pools.append(
-        hdls["ms2"].pool_create(cfg.get("name"), cfg.get("uuid"), [cfg.get("uri")])
+    pools = concurrently(
+        lambda ms: hdls[ms].pool_create(
+            cfg.get("name"), cfg.get("uuid"), [cfg.get("uri")]
+        ),
+        ["ms1", "ms2"],
     )
+    pools = list(pools.values())
 
     for p in pools:
         assert p.state == pool_pb.POOL_ONLINE
 
     yield pools
     try:
-        hdls["ms1"].pool_destroy(cfg.get("name"))
-        hdls["ms2"].pool_destroy(cfg.get("name"))
+        concurrently(lambda ms: hdls[ms].pool_destroy(cfg.get("name")), ["ms1", "ms2"])
     except Exception:
         pass
 
@@ -187,17 +185,18 @@ def create_pools(containers, mayastors, pool_config):
 def create_replica(mayastors, replica_uuid, create_pools):
     hdls = mayastors
     pools = create_pools
-    replicas = []
 
     UUID, name, size_mb = replica_uuid
 
-    replicas.append(hdls["ms1"].replica_create(pools[0].uuid, name, UUID, size_mb))
-    replicas.append(hdls["ms2"].replica_create(pools[0].uuid, name, UUID, size_mb))
+    replicas = concurrently(
+        lambda ms: hdls[ms].replica_create(pools[0].uuid, name, UUID, size_mb),
+        ["ms1", "ms2"],
+    )
+    replicas = list(replicas.values())
 
     yield replicas
     try:
-        hdls["ms1"].replica_destroy(UUID)
-        hdls["ms2"].replica_destroy(UUID)
+        concurrently(lambda ms: hdls[ms].replica_destroy(UUID), ["ms1", "ms2"])
     except Exception as e:
         logging.debug(e)
 
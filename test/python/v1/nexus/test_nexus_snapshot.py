@@ -9,7 +9,7 @@ from pytest_bdd import (
 
 from common.nvme import nvme_connect, nvme_disconnect, nvme_disconnect_all
 
-from v1.mayastor import container_mod, mayastor_mod
+from v1.mayastor import container_mod, mayastor_mod, concurrently
 
 from common.fio import Fio
 import time
@@ -59,7 +59,7 @@ def given_a_published_one_replica_nexus(connect_nexus_1):
 def start_fio_client(connect_nexus_1):
     dev = connect_nexus_1
     fio = Fio("job1", "randwrite", dev, runtime=FIO_RUNTIME).build()
-    f = subprocess.Popen(fio, shell=True)
+    f = subprocess.Popen(fio)
     yield f
     f.communicate()
 
@@ -234,21 +234,19 @@ def create_pools(mayastor_mod, pool_config):
     hdls = mayastor_mod
 
     cfg = pool_config
-    pools = []
-
-    pools.append(
-        hdls["ms1"].pool_create(cfg.get("name"), cfg.get("uuid"), cfg.get("disks"))
-    )
-    pools.append(
-        hdls["ms2"].pool_create(cfg.get("name"), cfg.get("uuid"), cfg.get("disks"))
+    pools = concurrently(
+        lambda ms: hdls[ms].pool_create(
+            cfg.get("name"), cfg.get("uuid"), cfg.get("disks")
+        ),
+        ["ms1", "ms2"],
     )
+    pools = list(pools.values())
 
     for p in pools:
         assert p.state == pool_pb.POOL_ONLINE
     yield pools
     try:
-        hdls["ms1"].pool_destroy(cfg.get("name"))
-        hdls["ms2"].pool_destroy(cfg.get("name"))
+        concurrently(lambda ms: hdls[ms].pool_destroy(cfg.get("name")), ["ms1", "ms2"])
     except Exception:
         pass
 
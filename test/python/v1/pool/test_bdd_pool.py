@@ -4,12 +4,13 @@ import pytest
 
 from pytest_bdd import (
     given,
-    scenario,
+    scenarios,
     then,
     when,
     parsers,
 )
 
+from common.channel import rpc_future
 from common.command import run_cmd
 from v1.mayastor import container_mod, mayastor_mod
 
@@ -17,79 +18,7 @@ import grpc
 import pool_pb2 as pb
 
 
-@scenario("features/pool.feature", "creating a pool using disk with invalid block size")
-def test_creating_a_pool_using_disk_with_invalid_block_size():
-    """creating a pool using disk with invalid block size."""
-
-
-@scenario("features/pool.feature", "creating a pool using invalid uuid")
-def test_creating_a_pool_using_disk_with_invalid_uuid():
-    """creating a pool using invalid uuid."""
-
-
-@scenario("features/pool.feature", "creating a pool using valid uuid")
-def test_creating_a_pool_using_disk_with_valid_uuid():
-    """creating a pool using valid uuid."""
-
-
-@scenario("features/pool.feature", "creating a pool with a name that already exists")
-def test_creating_a_pool_with_a_name_that_already_exists():
-    """creating a pool with a name that already exists."""
-
-
-@scenario("features/pool.feature", "creating a pool with an AIO disk")
-def test_creating_a_pool_with_an_aio_disk():
-    """creating a pool with an AIO disk."""
-
-
-@scenario("features/pool.feature", "creating a pool with multiple disks")
-def test_creating_a_pool_with_multiple_disks():
-    """creating a pool with multiple disks."""
-
-
-@scenario("features/pool.feature", "destroying a pool")
-def test_destroying_a_pool():
-    """destroying a pool."""
-
-
-@scenario("features/pool.feature", "destroying a pool that does not exist")
-def test_destroying_a_pool_that_does_not_exist():
-    """destroying a pool that does not exist."""
-
-
-@scenario("features/pool.feature", "exporting a pool removes the pool from the system")
-def test_exporting_a_pool_removes_the_pool_from_the_system():
-    """exporting a pool removes the pool from the system."""
-
-
-@scenario("features/pool.feature", "importing a pool")
-def test_importing_a_pool():
-    """importing a pool."""
-
-
-@scenario("features/pool.feature", "importing a pool with uuid")
-def test_importing_a_pool_with_uuid():
-    """importing a pool with uuid."""
-
-
-@scenario("features/pool.feature", "importing a pool with invalid uuid")
-def test_importing_a_pool_with_invalid_uuid():
-    """importing a pool with invalid uuid."""
-
-
-@scenario("features/pool.feature", "listing pool by name")
-def test_listing_pool_by_name():
-    """listing pool by name."""
-
-
-@scenario("features/pool.feature", "listing pool by name which does not exists")
-def test_listing_pool_by_name_which_does_not_exists():
-    """listing pool by name which does not exists."""
-
-
-@scenario("features/pool.feature", "listing pools")
-def test_listing_pools():
-    """listing pools."""
+scenarios("features/pool.feature")
 
 
 @pytest.fixture
@@ -104,12 +33,11 @@ def image_file():
 @pytest.fixture
 def find_pool(get_mayastor_instance):
     def find(name):
-        for pool in get_mayastor_instance.pool_rpc.ListPools(
-            pb.ListPoolOptions()
-        ).pools:
-            if pool.name == name:
-                return pool
-        return None
+        # Let the server filter by name, it returns at most one pool.
+        opts = pb.ListPoolOptions()
+        opts.name.value = name
+        pools = get_mayastor_instance.pool_rpc.ListPools(opts).pools
+        return pools[0] if pools else None
 
     yield find
 
@@ -118,15 +46,20 @@ def find_pool(get_mayastor_instance):
 def replica_pools(get_mayastor_instance):
     pools = {}
     yield pools
+    # List all pools once, then destroy those still present concurrently.
+    existing = {
+        pool.name: pool
+        for pool in get_mayastor_instance.pool_rpc.ListPools(pb.ListPoolOptions()).pools
+    }
+    futures = []
     for name in pools.keys():
-        opts = pb.ListPoolOptions()
-        opts.name.value = name
-        pools = get_mayastor_instance.pool_rpc.ListPools(opts).pools
-        if len(pools) != 0:
+        if name in existing:
             opts = pb.DestroyPoolRequest()
-            opts.name = pools[0].name
-            opts.uuid.value = pools[0].uuid
-            get_mayastor_instance.pool_rpc.DestroyPool(opts)
+            opts.name = existing[name].name
+            opts.uuid.value = existing[name].uuid
+            futures.append(rpc_future(get_mayastor_instance.pool_rpc.DestroyPool, opts))
+    for future in futures:
+        future.result()
 
 
 @pytest.fixture
@@ -308,14 +241,14 @@ def the_pool_destroy_command_should_fail(destroy_non_existing_pool):
 
 @then("the pool should appear in the output list")
 def pool_should_appear_in_output(get_pool_name, list_pools):
-    assert get_pool_name in [pool.name for pool in list_pools]
+    assert get_pool_name in {pool.name for pool in list_pools}
 
 
 @then("only the pool p0 should appear in the output list")
 def only_the_pool_p0_should_appear_in_the_output_list(list_existing_pool):
     pools = list_existing_pool
     assert len(pools) == 1
-    assert "p0" in [pool.name for pool in pools]
+    assert "p0" in {pool.name for pool in pools}
 
 
 @then("no pool should not appear in the output list")
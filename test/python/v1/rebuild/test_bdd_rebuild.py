@@ -1,10 +1,10 @@
 import pytest
-from pytest_bdd import given, scenario, then, when, parsers
+from pytest_bdd import given, scenarios, then, when, parsers
 
 import os
-import subprocess
-import time
 
+from common.command import create_local_files, remove_local_files
+from common.rebuild import cancel_rebuild, wait_rebuild_state
 from v1.mayastor import container_mod, mayastor_mod
 from v1.volume import Volume
 
@@ -23,75 +23,49 @@ def find_child(nexus, uri):
     return None
 
 
-def convert_nexus_state(state):
-    STATES = {
-        "UNKNOWN": pb.NexusState.NEXUS_UNKNOWN,
-        "ONLINE": pb.NexusState.NEXUS_ONLINE,
-        "DEGRADED": pb.NexusState.NEXUS_DEGRADED,
-        "FAULTED": pb.NexusState.NEXUS_FAULTED,
-    }
-    return STATES[state]
-
+NEXUS_STATES = {
+    "UNKNOWN": pb.NexusState.NEXUS_UNKNOWN,
+    "ONLINE": pb.NexusState.NEXUS_ONLINE,
+    "DEGRADED": pb.NexusState.NEXUS_DEGRADED,
+    "FAULTED": pb.NexusState.NEXUS_FAULTED,
+}
 
-def convert_child_state(state):
-    STATES = {
-        "UNKNOWN": pb.ChildState.CHILD_UNKNOWN,
-        "ONLINE": pb.ChildState.CHILD_ONLINE,
-        "DEGRADED": pb.ChildState.CHILD_DEGRADED,
-        "FAULTED": pb.ChildState.CHILD_FAULTED,
-    }
-    return STATES[state]
 
-
-def convert_child_action(state):
-    ACTIONS = {
-        "OFFLINE": pb.ChildAction.Offline,
-        "ONLINE": pb.ChildAction.Online,
-    }
-    return ACTIONS[state]
-
-
-@scenario("features/rebuild.feature", "running rebuild")
-def test_running_rebuild():
-    "Running rebuild."
+def convert_nexus_state(state):
+    return NEXUS_STATES[state]
 
 
-@scenario("features/rebuild.feature", "stopping rebuild")
-def test_stopping_rebuild():
-    "Stopping rebuild."
+CHILD_STATES = {
+    "UNKNOWN": pb.ChildState.CHILD_UNKNOWN,
+    "ONLINE": pb.ChildState.CHILD_ONLINE,
+    "DEGRADED": pb.ChildState.CHILD_DEGRADED,
+    "FAULTED": pb.ChildState.CHILD_FAULTED,
+}
 
 
-@scenario("features/rebuild.feature", "pausing rebuild")
-def test_pausing_rebuild():
-    "Pausing rebuild."
+def convert_child_state(state):
+    return CHILD_STATES[state]
 
 
-@scenario("features/rebuild.feature", "resuming rebuild")
-def test_resuming_rebuild():
-    "Resuming rebuild."
+CHILD_ACTIONS = {
+    "OFFLINE": pb.ChildAction.Offline,
+    "ONLINE": pb.ChildAction.Online,
+}
 
 
-@scenario("features/rebuild.feature", "setting a child ONLINE")
-def test_setting_a_child_online():
-    "Setting a child ONLINE."
+def convert_child_action(state):
+    return CHILD_ACTIONS[state]
 
 
-@scenario("features/rebuild.feature", "setting a child OFFLINE")
-def test_setting_a_child_offline():
-    "Setting a child OFFLINE."
+scenarios("features/rebuild.feature")
 
 
 @pytest.fixture(scope="module")
 def local_files():
     files = [f"/tmp/disk-rebuild-{base}.img" for base in ["source", "target"]]
-    for path in files:
-        subprocess.run(
-            ["sudo", "sh", "-c", f"rm -f '{path}' && truncate -s 64M '{path}'"],
-            check=True,
-        )
+    create_local_files(files, megabytes(64))
     yield
-    for path in files:
-        subprocess.run(["sudo", "rm", "-f", path], check=True)
+    remove_local_files(files)
 
 
 @pytest.fixture(scope="module")
@@ -122,17 +96,21 @@ def mayastor_instance(mayastor_mod):
 @pytest.fixture(scope="module")
 def find_nexus(mayastor_instance):
     def find(uuid):
-        for nexus in mayastor_instance.nexus_rpc.ListNexus(
-            pb.ListNexusOptions()
-        ).nexus_list:
-            if nexus.uuid == uuid:
-                return nexus
-        return None
+        # Let the instance look the nexus up instead of listing all of them.
+        opts = pb.ListNexusOptions()
+        opts.uuid.value = uuid
+        try:
+            nexus_list = mayastor_instance.nexus_rpc.ListNexus(opts).nexus_list
+        except grpc.RpcError as error:
+            if error.code() == grpc.StatusCode.NOT_FOUND:
+                return None
+            raise
+        return nexus_list[0] if nexus_list else None
 
     yield find
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mayastor_nexus(mayastor_instance, nexus_name, nexus_uuid, source_uri):
     nexus = mayastor_instance.nexus_rpc.CreateNexus(
         pb.CreateNexusRequest(
@@ -150,6 +128,21 @@ def mayastor_nexus(mayastor_instance, nexus_name, nexus_uuid, source_uri):
     mayastor_instance.nexus_rpc.DestroyNexus(pb.DestroyNexusRequest(uuid=nexus_uuid))
 
 
+@pytest.fixture(autouse=True)
+def reset_nexus_children(mayastor_instance, mayastor_nexus, nexus_uuid, target_uri):
+    "Remove the target child after each scenario, leaving the nexus with its source."
+    yield
+    cancel_rebuild(mayastor_instance, nexus_uuid, target_uri)
+    try:
+        mayastor_instance.nexus_rpc.RemoveChildNexus(
+            pb.RemoveChildNexusRequest(uuid=nexus_uuid, uri=target_uri)
+        )
+    except grpc.RpcError as error:
+        # The scenario did not get to add the target child.
+        if error.code() != grpc.StatusCode.NOT_FOUND:
+            raise
+
+
 @pytest.fixture
 def nexus_state(mayastor_nexus, find_nexus, nexus_uuid):
     yield find_nexus(nexus_uuid)
@@ -196,7 +189,7 @@ def pause_rebuild(mayastor_instance, mayastor_nexus, nexus_uuid, target_uri):
     mayastor_instance.nexus_rpc.PauseRebuild(
         pb.PauseRebuildRequest(nexus_uuid=nexus_uuid, uri=target_uri)
     )
-    time.sleep(0.5)
+    wait_rebuild_state(mayastor_instance, nexus_uuid, target_uri, "paused")
 
 
 @when("the rebuild operation is then resumed")
@@ -211,7 +204,7 @@ def stop_rebuild(mayastor_instance, mayastor_nexus, nexus_uuid, target_uri):
     mayastor_instance.nexus_rpc.StopRebuild(
         pb.StopRebuildRequest(nexus_uuid=nexus_uuid, uri=target_uri)
     )
-    time.sleep(0.5)
+    wait_rebuild_state(mayastor_instance, nexus_uuid, target_uri, None)
 
 
 @when("the rebuild statistics are requested", target_fixture="rebuild_statistics")
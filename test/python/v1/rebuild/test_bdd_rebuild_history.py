@@ -18,9 +18,9 @@ from pytest_bdd import (
 )
 
 import os
-import subprocess
 import time
 
+from common.command import create_local_files, remove_local_files
 from v1.mayastor import container_mod, mayastor_mod
 from v1.volume import Volume
 
@@ -42,14 +42,9 @@ def local_files():
     files = [
         f"/tmp/disk-rebuild-{base}.img" for base in ["source", "target", "newchild"]
     ]
-    for path in files:
-        subprocess.run(
-            ["sudo", "sh", "-c", f"rm -f '{path}' && truncate -s 64M '{path}'"],
-            check=True,
-        )
+    create_local_files(files, megabytes(64))
     yield
-    for path in files:
-        subprocess.run(["sudo", "rm", "-f", path], check=True)
+    remove_local_files(files)
 
 
 @pytest.fixture(scope="module")
@@ -85,12 +80,16 @@ def mayastor_instance(mayastor_mod):
 @pytest.fixture(scope="module")
 def find_nexus(mayastor_instance):
     def find(uuid):
-        for nexus in mayastor_instance.nexus_rpc.ListNexus(
-            pb.ListNexusOptions()
-        ).nexus_list:
-            if nexus.uuid == uuid:
-                return nexus
-        return None
+        # Let the instance look the nexus up instead of listing all of them.
+        opts = pb.ListNexusOptions()
+        opts.uuid.value = uuid
+        try:
+            nexus_list = mayastor_instance.nexus_rpc.ListNexus(opts).nexus_list
+        except grpc.RpcError as error:
+            if error.code() == grpc.StatusCode.NOT_FOUND:
+                return None
+            raise
+        return nexus_list[0] if nexus_list else None
 
     yield find
 
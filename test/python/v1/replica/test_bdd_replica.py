@@ -2,6 +2,7 @@ import pytest
 from pytest_bdd import (
     given,
     scenario,
+    scenarios,
     then,
     when,
     parsers,
@@ -15,106 +16,6 @@ import replica_pb2 as replica_pb
 import common_pb2 as common_pb
 
 
-@scenario("features/replica.feature", "creating a replica")
-def test_creating_a_replica():
-    """Creating a replica."""
-
-
-@scenario("features/replica.feature", 'creating a replica shared over "iscsi"')
-def test_fail_creating_a_replica_shared_over_iscsi():
-    """Creating a replica shared over "iscsi"."""
-
-
-@scenario("features/replica.feature", 'creating a replica shared over "nvmf"')
-def test_creating_a_replica_shared_over_nvmf():
-    """Creating a replica shared over "nvmf"."""
-
-
-@scenario(
-    "features/replica.feature", "creating a replica with a name that already exists"
-)
-def test_creating_a_replica_with_a_name_that_already_exists():
-    """Creating a replica with a name that already exists."""
-
-
-@scenario(
-    "features/replica.feature", "creating a replica with a uuid that already exists"
-)
-def test_creating_a_replica_with_a_uuid_that_already_exists():
-    """Creating a replica with a uuid that already exists."""
-
-
-@scenario("features/replica.feature", "destroying a replica")
-def test_destroying_a_replica():
-    """Destroying a replica."""
-
-
-@scenario("features/replica.feature", "destroying a replica that does not exist")
-def test_fail_destroying_a_replica_that_does_not_exist():
-    """Destroying a replica that does not exist."""
-
-
-@scenario("features/replica.feature", "listing replicas")
-def test_listing_replicas():
-    """Listing replicas."""
-
-
-@scenario("features/replica.feature", "listing replicas by replica name")
-def test_listing_replicas_by_replica_name():
-    """Listing replicas by replica name."""
-
-
-@scenario(
-    "features/replica.feature", "listing replicas by pool name on a pool with replicas"
-)
-def test_listing_replicas_by_pool_name_with_replica():
-    """Listing replicas by pool name on a pool with replicas."""
-
-
-@scenario(
-    "features/replica.feature",
-    "listing replicas by pool name with a non-existent pool name",
-)
-def test_listing_replicas_by_pool_name_with_non_existent_pool():
-    """Listing replicas by pool name with a non-existent pool name."""
-
-
-@scenario("features/replica.feature", 'sharing a replica over "iscsi"')
-def test_fail_sharing_a_replica_over_iscsi():
-    """Sharing a replica over "iscsi"."""
-
-
-@scenario("features/replica.feature", 'sharing a replica over "nvmf"')
-def test_sharing_a_replica_over_nvmf():
-    """Sharing a replica over "nvmf"."""
-
-
-@scenario(
-    "features/replica.feature",
-    "sharing a replica that is already shared with a different protocol",
-)
-def test_fail_sharing_a_replica_that_is_already_shared_with_a_different_protocol():
-    """Sharing a replica that is already shared with a different protocol."""
-
-
-@scenario(
-    "features/replica.feature",
-    "sharing a replica that is already shared with the same protocol",
-)
-def test_sharing_a_replica_that_is_already_shared_with_the_same_protocol():
-    """Sharing a replica that is already shared with the same protocol."""
-
-
-@scenario("features/replica.feature", "unsharing a shared replica")
-def test_unsharing_a_shared_replica():
-    """Unsharing a shared replica."""
-
-
-@scenario("features/replica.feature", "unsharing a replica that is not shared")
-def test_unsharing_a_non_shared_replica():
-    """Unsharing a replica that is not shared."""
-
-
 @pytest.mark.skip(reason="todo")
 @scenario("features/replica.feature", "reading from a shared replica")
 def test_reading_from_a_shared_replica():
@@ -127,12 +28,17 @@ def test_writing_to_a_shared_replica():
     """Writing to a shared replica."""
 
 
+scenarios("features/replica.feature")
+
+
+PROTOCOLS = {
+    "none": common_pb.NONE,
+    "nvmf": common_pb.NVMF,
+    "iscsi": common_pb.ISCSI,
+}
+
+
 def share_protocol(name):
-    PROTOCOLS = {
-        "none": common_pb.NONE,
-        "nvmf": common_pb.NVMF,
-        "iscsi": common_pb.ISCSI,
-    }
     return PROTOCOLS[name]
 
 
@@ -170,10 +76,10 @@ def replica_size():
 @pytest.fixture
 def find_replica(mayastor_instance, mayastor_lvs_pool):
     def find(name, uuid):
-        for replica in mayastor_instance.replica_rpc.ListReplicas(
-            replica_pb.ListReplicaOptions()
-        ).replicas:
-            if replica.name == name and replica.uuid == uuid:
+        opts = replica_pb.ListReplicaOptions()
+        opts.name.value = name
+        for replica in mayastor_instance.replica_rpc.ListReplicas(opts).replicas:
+            if replica.uuid == uuid:
                 return replica
         return None
 
@@ -444,17 +350,17 @@ def create_replica_should_succeed(find_replica, replica_name, replica_uuid):
 
 @then(parsers.parse('"{name}" should appear in the output list'))
 def replica_should_appear_in_output_list(name, list_replicas):
-    assert name in [replica.name for replica in list_replicas]
+    assert name in {replica.name for replica in list_replicas}
 
 
 @then(parsers.parse('"{name}" should appear in the output list based on replica name'))
 def replica_should_appear_in_output_list(name, list_replicas_by_name):
-    assert name in [replica.name for replica in list_replicas_by_name]
+    assert name in {replica.name for replica in list_replicas_by_name}
 
 
 @then(parsers.parse('"{name}" should appear in the output list based on pool name'))
 def replica_should_appear_in_output_list(name, list_replicas_by_pool_name):
-    assert name in [replica.name for replica in list_replicas_by_pool_name]
+    assert name in {replica.name for replica in list_replicas_by_pool_name}
 
 
 @then(